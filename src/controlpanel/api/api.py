@@ -1,5 +1,3 @@
-import time
-import threading
 from typing import TypeVar
 from controlpanel.shared.base import Device
 from controlpanel.api.dummy import Fixture
@@ -34,19 +32,17 @@ def fire_event(source: EventSourceType | None = None,
     services.event_manager.fire_event(source, action, value, sender=sender, ts=ts)
 
 
-def call_with_frequency(frequency: float | int):
+def call_with_frequency(frequency: float | int, *, align_to_frame: bool = False):
+    """Call the decorated function frequency times per second, starting right away. Call .stop() on the function to
+    stop. Runs are scheduled at a fixed rate by the EventManager's TickScheduler. If align_to_frame is set, runs are
+    phase-aligned with the frames sent out to the fixtures."""
     def decorator(func):
         def wrapper(*args, **kwargs):
-            def run_function():
-                interval = 1 / frequency  # Calculate interval based on frequency
-                setattr(wrapper, "_is_running", True)
-                setattr(wrapper, "stop", lambda: setattr(wrapper, "_is_running", False))
-                while getattr(wrapper, "_is_running"):
-                    func(*args, **kwargs)
-                    time.sleep(interval)  # Wait for the calculated interval
-
-            thread = threading.Thread(target=run_function, daemon=True)
-            thread.start()
+            if not services.event_manager:
+                raise RuntimeError("Event manager not initialized")
+            task = services.event_manager.tick_scheduler.schedule(func, frequency, *args,
+                                                                  align_to_frame=align_to_frame, **kwargs)
+            setattr(wrapper, "stop", task.stop)
 
         wrapper()  # Automatically start the function without needing to call it
         return wrapper
@@ -60,7 +56,9 @@ def subscribe(callback: CallbackType,
               condition_value: EventValueType | None,
               *,
               fire_once=False,
-              allow_parallelism: bool = False
+              allow_parallelism: bool = False,
+              coalesce: bool = False,
+              inline: bool = False,
               ) -> None:
     if not services.event_manager:
         raise RuntimeError("Event manager not initialized")
@@ -69,7 +67,9 @@ def subscribe(callback: CallbackType,
                                      action,
                                      condition_value,
                                      fire_once=fire_once,
-                                     allow_parallelism=allow_parallelism)
+                                     allow_parallelism=allow_parallelism,
+                                     coalesce=coalesce,
+                                     inline=inline)
 
 
 def send_dmx(device_name: str, data: bytes):
@@ -83,3 +83,6 @@ def send_dmx(device_name: str, data: bytes):
     universe = device.universe
     print(f"Sending DMX Package to {device_name} @ {universe} with data {data}")
     services.artnet.send_dmx(universe, 0, bytearray(data))
+    frame_scheduler = services.event_manager.frame_scheduler
+    if frame_scheduler.synchronous:
+        frame_scheduler.request_sync()  # nodes in sync mode would hold the data back otherwise
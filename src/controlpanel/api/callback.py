@@ -14,6 +14,8 @@ def callback(*,
     value: Hashable | list[Hashable] | None = None,
     fire_once: bool = False,
     allow_parallelism: bool = False,
+    coalesce: bool = False,
+    inline: bool = False,
     ) -> Callable[[F], F]:
 
     def normalize(x: Union[str, T, list[T], None]) -> list[T] | list[None]:
@@ -31,7 +33,9 @@ def callback(*,
         for s, a, v in product(sources, actions, values):
             subscribe(func, s, a, v,
                       fire_once=fire_once,
-                      allow_parallelism=allow_parallelism)
+                      allow_parallelism=allow_parallelism,
+                      coalesce=coalesce,
+                      inline=inline)
         return func
 
     return decorator
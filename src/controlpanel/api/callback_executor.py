@@ -0,0 +1,74 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorStats:
+    """Queue depth and throughput of a single script's thread pool. Only modified on the event loop."""
+    __slots__ = ("submitted", "completed", "failed", "pending", "max_pending", "busy_time")
+
+    def __init__(self) -> None:
+        self.submitted: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.pending: int = 0  # submitted, but not yet finished
+        self.max_pending: int = 0
+        self.busy_time: float = 0.0  # total seconds spent running callbacks
+
+
+class CallbackExecutor:
+    """Runs synchronous callbacks in one bounded thread pool per userscript.
+    Callbacks are assigned to a pool by the name of the module they were defined in, so a script that blocks all of its
+    workers only delays its own callbacks."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_workers_per_script: int = 4) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self.max_workers_per_script: int = max_workers_per_script
+        self._pools: dict[str, ThreadPoolExecutor] = {}
+        self.stats: dict[str, ExecutorStats] = {}
+
+    @staticmethod
+    def script_name(func: Callable) -> str:
+        return (getattr(func, "__module__", None) or "<unknown>").rsplit(".", maxsplit=1)[-1]
+
+    def _get_pool(self, script: str) -> ThreadPoolExecutor:
+        pool = self._pools.get(script)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=self.max_workers_per_script, thread_name_prefix=f"callback-{script}")
+            self._pools[script] = pool
+            self.stats[script] = ExecutorStats()
+        return pool
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> asyncio.Future:
+        """Run func(*args, **kwargs) in the pool of its script. Must be called from the event loop.
+        The returned future resolves to the number of seconds the call took."""
+        script = self.script_name(func)
+        pool = self._get_pool(script)
+        stats = self.stats[script]
+        stats.submitted += 1
+        stats.pending += 1
+        stats.max_pending = max(stats.max_pending, stats.pending)
+        future = self._loop.run_in_executor(pool, self._timed_call, func, args, kwargs)
+        future.add_done_callback(lambda f: self._on_done(f, func, stats))
+        return future
+
+    @staticmethod
+    def _timed_call(func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> float:
+        """Runs in the worker thread. Returns the time it took to run the callback."""
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _on_done(future: asyncio.Future, func: Callable, stats: ExecutorStats) -> None:
+        stats.pending -= 1
+        if future.cancelled():
+            return
+        exception = future.exception()
+        if exception is not None:
+            stats.failed += 1
+            print(f"[CallbackExecutor] {CallbackExecutor.script_name(func)}.{func.__name__} raised {exception!r}")
+            return
+        stats.completed += 1
+        stats.busy_time += future.result()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable, Optional, Coroutine, Any
 import asyncio
 import pygame as pg
@@ -43,13 +43,17 @@ CallbackType = (Callable[[Event], Coroutine[Any, Any, None]] |
                 )
 
 
-@dataclass
+@dataclass(eq=False)
 class Subscriber:
     callback: CallbackType
+    condition: Condition
     fire_once: bool
     allow_parallelism: bool
     requires_event_arg: bool
-    task: Optional[asyncio.Task] = None
+    coalesce: bool = False
+    inline: bool = False
+    task: Optional[asyncio.Future] = None
+    pending_events: dict[EventSourceType, Event] = field(default_factory=dict)  # newest event per source, if coalescing
 
 
 class SPIConfig(TypedDict):
@@ -67,3 +71,4 @@ class NodeConfig(TypedDict):
     SPI: SPIConfig
     I2C: I2CConfig
     devices: dict[str, tuple[str, dict[str, float | int | str], dict[str, float | int | str]]]
+    acknowledge: NotRequired[bool]
@@ -26,6 +26,8 @@ class ADC(Sensor):
         self.map_range: tuple[float, float] | None = map_range
         self._clamp: bool = clamp
         self._rolling_average_deque: deque[float] | None = deque(maxlen=rolling_average_size) if (rolling_average_size and rolling_average_size > 1) else None
+        self._rolling_sum: float = 0.0  # sum of the values in the deque, updated as values enter and leave it
+        self._rolling_updates: int = 0  # values added since the sum was last recomputed from scratch
 
     @property
     def desynced(self) -> bool:
@@ -68,8 +70,18 @@ class ADC(Sensor):
             mapped = decoded
 
         if self._rolling_average_deque is not None:
-            self._rolling_average_deque.append(mapped)
-            average = sum(self._rolling_average_deque) / len(self._rolling_average_deque)
+            window = self._rolling_average_deque
+            if len(window) == window.maxlen:
+                self._rolling_sum -= window[0]
+            window.append(mapped)
+            self._rolling_updates += 1
+            if self._rolling_updates >= window.maxlen:
+                # Recomputed once per window, so the rounding errors of the running sum can't build up over time
+                self._rolling_sum = sum(window)
+                self._rolling_updates = 0
+            else:
+                self._rolling_sum += mapped
+            average = self._rolling_sum / len(window)
         else:
             average = mapped
 
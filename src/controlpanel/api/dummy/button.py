@@ -44,10 +44,12 @@ class Button(Sensor):
             self.release()
 
     def parse_trigger_payload(self, data: bytes, timestamp: float) -> None:
-        assert len(data) == 1, "Data is of unexpected length"
-        is_pressed: bool = bool(data[0])
-        self._real_state = is_pressed
-        if is_pressed:
-            self.press()
-        else:
-            self.release()
+        # Two states are sent if the button was pressed and released before the node reported it
+        assert len(data) in (1, 2), "Data is of unexpected length"
+        for state in data:
+            is_pressed: bool = bool(state)
+            self._real_state = is_pressed
+            if is_pressed:
+                self.press()
+            else:
+                self.release()
@@ -1,4 +1,13 @@
-from controlpanel.shared.base import Device
+from enum import Enum
+from controlpanel.shared.base import Device, LinkQuality
+from controlpanel.api.telemetry import NodeTelemetry
+
+
+class NodeState(Enum):
+    NEVER_CONNECTED = "Never connected"
+    ONLINE = "Online"
+    MISSING = "Missing"  # failed to reply to the most recent poll(s)
+    LOST = "Lost connection!"
 
 
 class ESP32:
@@ -6,6 +15,11 @@ class ESP32:
         self.name: str = name
         self.mac: str | None = None
         self.ip: str | None = None
-        self.status: str | None = "Never connected"
+        self.state: NodeState = NodeState.NEVER_CONNECTED
+        self.status: str | None = "Never connected"  # the node report of the most recent ArtPollReply
         self.devices: dict[str, Device] = {}
         self.subsequent_missed_replies: int | None = None
+        self.last_seen: float | None = None  # time.monotonic() of the last ArtPollReply or ping reply
+        self.acknowledge: bool = False  # whether the node acknowledges DMX data and expects acknowledgements for triggers
+        self.link: LinkQuality = LinkQuality()
+        self.telemetry: NodeTelemetry = NodeTelemetry()
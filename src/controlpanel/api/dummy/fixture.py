@@ -1,26 +1,68 @@
 import asyncio
 from abc import abstractmethod
+from typing import TYPE_CHECKING
 from controlpanel.api.dummy.esp32 import ESP32
 from controlpanel.shared.base import BaseFixture
+from controlpanel import api
+if TYPE_CHECKING:
+    from controlpanel.api.frame_scheduler import FrameScheduler
 
 
 class Fixture(BaseFixture):
+    COALESCE_FRAMES: bool = False  # whether changes are collected and sent once per frame by default
+    ACK_TIMEOUT: float = 0.1  # seconds to wait for an acknowledgement before the first retransmit, doubled each time
+
     def __init__(self, _artnet, _loop, _esp, _name: str, /, universe: int | None) -> None:
         super().__init__(_artnet, _name, universe=universe)
         self._loop: asyncio.AbstractEventLoop = _loop
         self._current_task: asyncio.Future | None = None
         self._esp: ESP32 = _esp
         self._deafened: bool = False
+        self._coalesce_frames: bool = self.COALESCE_FRAMES
+        self._acked_universes: set[int] = set()  # universes that acknowledged the current seq
 
     @property
     def deafened(self) -> bool:
         return self._deafened
 
+    @property
+    def coalesce_frames(self) -> bool:
+        return self._coalesce_frames
+
+    @coalesce_frames.setter
+    def coalesce_frames(self, coalesce_frames: bool) -> None:
+        self._coalesce_frames = coalesce_frames
+
+    def _mark_dirty(self) -> None:
+        """Request a DMX update. If frame coalescing is enabled, the update is sent with the next frame,
+        otherwise it is sent immediately."""
+        event_manager = api.services.event_manager
+        if self._coalesce_frames and event_manager is not None:
+            event_manager.frame_scheduler.mark_dirty(self)
+        else:
+            self.send_dmx()
+
     def _send_dmx_packet(self, data: bytes | bytearray) -> None:
         if self._deafened:
             return
-
         self._increment_seq()
+        self._send_dmx_packets([(self.universe, data)])
+
+    def _send_dmx_packets(self, packets: list[tuple[int, bytes | bytearray]]) -> None:
+        """Send a frame that is spread across several universes with the current seq. The first transmission happens
+        right away, so that an ArtSync requested afterwards is guaranteed to follow it. In synchronous mode, each
+        transmission of the frame is followed by an ArtSync, so the node outputs all universes at once."""
+        if self._deafened:
+            return
+
+        event_manager = api.services.event_manager
+        frame_scheduler = event_manager.frame_scheduler if event_manager is not None else None
+        sync = frame_scheduler is not None and frame_scheduler.synchronous
+
+        self._acked_universes = set()
+        self._transmit(self._seq, packets)
+        if sync:
+            frame_scheduler.request_sync()
 
         # Cancel any ongoing packet send task
         if self._current_task and not self._current_task.done():
@@ -28,14 +70,55 @@ class Fixture(BaseFixture):
 
         # Start a new packet send task
         self._current_task = asyncio.run_coroutine_threadsafe(
-            self._send_packets(self._seq, data),
+            self._retransmit_packets(self._seq, packets, frame_scheduler if sync else None),
             self._loop
         )
 
-    async def _send_packets(self, seq: int, data: bytes | bytearray) -> None:
-        for _ in range(3):
-            self._artnet.send_dmx(self.universe, seq, data, ip_override=self._esp.ip)
-            await asyncio.sleep(0.5)
+    def _transmit(self, seq: int, packets: list[tuple[int, bytes | bytearray]]) -> None:
+        for universe, data in packets:
+            self._artnet.send_dmx(universe, seq, data, ip_override=self._esp.ip)
+
+    def _retransmit(self, seq: int, packets: list[tuple[int, bytes | bytearray]],
+                    frame_scheduler: "FrameScheduler | None") -> None:
+        if frame_scheduler is None:
+            self._transmit(seq, packets)
+            return
+        # An ArtSync of its own would latch whatever the nodes hold right now, including frames that only partly
+        # arrived. Sent with the next frame instead, unless a newer frame has been sent by then.
+        frame_scheduler.defer_send(lambda: self._transmit(seq, packets) if seq == self._seq else None)
+
+    async def _retransmit_packets(self, seq: int, packets: list[tuple[int, bytes | bytearray]],
+                                  frame_scheduler: "FrameScheduler | None") -> None:
+        """Retransmit the frame. In synchronous mode, the retransmits are sent with the next frame of the frame
+        scheduler, whose ArtSync latches them."""
+        if not self._esp.acknowledge:
+            for _ in range(2):
+                await asyncio.sleep(0.5)
+                self._retransmit(seq, packets, frame_scheduler)
+            return
+
+        # Retransmit unacknowledged universes with exponential backoff, as often as the link quality requires
+        link = self._esp.link
+        retransmits = link.retransmits()
+        timeout = self.ACK_TIMEOUT
+        for attempt in range(retransmits + 1):
+            await asyncio.sleep(timeout)
+            unacknowledged = [(universe, data) for universe, data in packets if universe not in self._acked_universes]
+            for _ in range(len(packets) - len(unacknowledged)):
+                link.record(True)
+            for _ in unacknowledged:
+                link.record(False)
+            if not unacknowledged or attempt == retransmits:
+                return
+            packets = unacknowledged
+            link.retransmitted += len(packets)
+            self._retransmit(seq, packets, frame_scheduler)
+            timeout *= 2
+
+    def acknowledge(self, universe: int, seq: int) -> None:
+        """Called on the event loop when the node acknowledged a DMX packet."""
+        if seq == self._seq:
+            self._acked_universes.add(universe)
 
     @abstractmethod
     def send_dmx(self) -> None:
@@ -1,47 +1,115 @@
 import asyncio
-from controlpanel.shared.base.led_strip import BaseLEDStrip
+from controlpanel.shared.base.led_strip import BaseLEDStrip, FRAME_TYPE_PIXELS, FRAME_TYPE_DELTA, COMPRESSION_HSL
 from .fixture import Fixture
 from typing import SupportsIndex, Literal, Callable, Generator
 from artnet import ArtNet
 import struct
+import time
+import numpy as np
 from .esp32 import ESP32
 
 
+RGBArray = np.ndarray  # shape (N, 3), dtype uint8
+_DELTA_RUN_HEADER_BYTES: int = 3
+
+
+def _build_hue_lut() -> np.ndarray:
+    """The fully saturated colors of the 256 hues, exactly as hsl_decompression.c computes them on the node."""
+    hue = np.arange(256) * 360 >> 8
+    region = hue // 60
+    remainder = (hue % 60) * 255 // 60
+    r = np.choose(region, [255, 255 - remainder, 0, 0, remainder, 255])
+    g = np.choose(region, [remainder, 255, 255, 255 - remainder, 0, 0])
+    b = np.choose(region, [0, 0, remainder, 255, 255, 255 - remainder])
+    return np.stack((r, g, b), axis=1)
+
+
+_HUE_LUT: np.ndarray = _build_hue_lut()  # shape (256, 3), dtype int
+
+
+def _uncompress_hsl(hue: np.ndarray, lightness: np.ndarray) -> np.ndarray:
+    """The RGB values the node decodes from hue and lightness bytes, as an (N, 3) int array."""
+    base = _HUE_LUT[hue]
+    lightness = lightness.astype(int)[:, np.newaxis]
+    darker = (base * (lightness << 1)) >> 8
+    lighter = base + (((255 - base) * ((lightness - 128) << 1)) >> 8)
+    return np.where(lightness < 128, darker, lighter)
+
+
+def _as_rgb_array(value) -> np.ndarray:
+    """Convert an (R, G, B) tuple, a sequence of them or an array into a uint8 array, validating the values."""
+    array = np.asarray(value)
+    if array.shape[-1:] != (3,):
+        raise ValueError("Each pixel must be a tuple of three integers between 0 and 255.")
+    if array.dtype != np.uint8:
+        if not np.issubdtype(array.dtype, np.integer) or (array.size and (array.min() < 0 or array.max() > 255)):
+            raise ValueError("Each pixel must be a tuple of three integers between 0 and 255.")
+    return array
+
+
 class _Pixels:
-    """A proxy class for the pixel list.
-    Automatically calls the update_callback function when a value in the list is changed."""
-    def __init__(self, pixels: list[tuple[int, int, int]], update_callback: Callable[[], None]):
-        self._pixels: list[tuple[int, int, int]] = pixels
+    """A proxy class for the pixel array that behaves like a list of (R, G, B) tuples.
+    Supports integer, slice, index array and boolean mask indexing.
+    Automatically calls the update_callback function when a value is changed."""
+    def __init__(self, pixels: RGBArray, update_callback: Callable[[], None]):
+        self._pixels: RGBArray = pixels
         self._update_callback: Callable[[], None] = update_callback
 
     def __getitem__(self, key):
-        return self._pixels[key]
+        if isinstance(key, (int, np.integer)):
+            return tuple(self._pixels[key].tolist())
+        return [tuple(rgb) for rgb in self._pixels[key].tolist()]
 
     def __setitem__(self, key, value):
-        self._pixels[key] = value
+        self._pixels[key] = _as_rgb_array(value)
         self._update_callback()
 
     def __len__(self):
         return len(self._pixels)
 
     def __iter__(self):
-        return iter(self._pixels)
+        return iter(self.tolist())
 
     def __repr__(self):
-        return repr(self._pixels)
-
-    def __getslice__(self, i, j):
-        return self._pixels[i:j]
-
-    def __setslice__(self, i, j, sequence):
-        self._pixels[i:j] = sequence
-        self._update_callback()
+        return repr(self.tolist())
 
     def __eq__(self, other):
-        return self._pixels == other
+        if isinstance(other, (_Pixels, np.ndarray)):
+            return np.array_equal(self._pixels, np.asarray(other))
+        return self.tolist() == other
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self._pixels, dtype=dtype)
+
+    def tolist(self) -> list[tuple[int, int, int]]:
+        return [tuple(rgb) for rgb in self._pixels.tolist()]
+
+
+class _Segment:
+    """The pixels of a strip that are sent in a single universe, along with the state needed for delta frames.
+    Delta frames contain every pixel that changed since the last keyframe, so any single one that arrives is enough."""
+    def __init__(self, universe: int, start: int, end: int) -> None:
+        self.universe: int = universe
+        self.start: int = start
+        self.end: int = end
+        self.keyframe: np.ndarray | None = None  # the encoded pixels of the last full frame
+        self.keyframe_seq: int = 0
+        self.keyframe_time: float = 0.0
+        self.deltas_since_keyframe: int = 0
+        self.touched: np.ndarray = np.zeros(end - start, dtype=bool)  # pixels that changed since the last keyframe
+
+    def set_keyframe(self, encoded: np.ndarray, seq: int) -> None:
+        self.keyframe = encoded.copy()
+        self.keyframe_seq = seq
+        self.keyframe_time = time.monotonic()
+        self.deltas_since_keyframe = 0
+        self.touched[:] = False
 
 
 class LEDStrip(BaseLEDStrip, Fixture):
+    COALESCE_FRAMES = True
+    KEYFRAME_INTERVAL: float = 2.0  # max. seconds between two full frames when sending delta frames
+    MAX_DELTAS_PER_KEYFRAME: int = 100  # must stay well below 255 so the keyframe's sequence number is unambiguous
     ANIMATIONS: dict[str, Callable[[float, bytearray, tuple[int, int, int]], Generator[None, None, None]]] = {
         animation.__name__: animation for animation in BaseLEDStrip.ANIMATIONS if animation is not None
     }
@@ -56,13 +124,23 @@ class LEDStrip(BaseLEDStrip, Fixture):
                  *,
                  universe: int | None =None,
                  rgb_order: Literal["RGB", "RBG", "GRB", "GBR", "BRG", "BGR"] = "RGB",
-                 use_compression: bool = False,
+                 use_compression: bool | Literal["hsl"] = False,
                  refresh_rate_hz: float = 30.0,
+                 use_delta_frames: bool = False,
                  ) -> None:
         BaseLEDStrip.__init__(self, rgb_order)
         Fixture.__init__(self, _artnet, _loop, _esp, _name, universe=universe)
-        self._pixel_proxy: _Pixels = _Pixels([(0, 0, 0) for _ in range(length)], self._send_pixel_data)
-        self._use_compression: bool = use_compression
+        self._pixel_array: RGBArray = np.zeros((length, 3), dtype=np.uint8)
+        self._pixel_proxy: _Pixels = _Pixels(self._pixel_array, self._on_pixels_changed)
+        self._use_compression: bool | Literal["hsl"] = use_compression
+        self._use_delta_frames: bool = use_delta_frames
+
+        # Strips that don't fit into a single universe are split across consecutive universes
+        pixels_per_universe = self.pixels_per_universe(use_compression)
+        self._segments: list[_Segment] = [
+            _Segment(self.universe + i, start, min(start + pixels_per_universe, length))
+            for i, start in enumerate(range(0, max(length, 1), pixels_per_universe))
+        ]
 
         self._animation_index: int | None = None
         self._animation_speed: float = 1.0
@@ -70,6 +148,10 @@ class LEDStrip(BaseLEDStrip, Fixture):
         self._secondary_animation_color: tuple[int, int, int] = (0, 50, 0)
         self._refresh_rate_hz: float = refresh_rate_hz
 
+    @property
+    def universes(self) -> tuple[int, ...]:
+        return tuple(segment.universe for segment in self._segments)
+
     def send_dmx(self) -> None:
         if self._animation_index is None:
             self._send_pixel_data()
@@ -113,35 +195,133 @@ class LEDStrip(BaseLEDStrip, Fixture):
         self._animation_speed = animation_speed
         self._primary_animation_color = primary_color
         self._secondary_animation_color = secondary_color
-        self._send_dmx_packet(self._pack_animation_bytes())
+        self._send_animation_data()
+
+    @staticmethod
+    def _compress_rgb(rgb: RGBArray) -> np.ndarray:
+        """
+        Convert an (N, 3) array of RGB values in the range 0..255
+        into an array of N RGB bytes in the format RRRGGGBB.
+        """
+        r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+        return (r & 0xE0) | ((g >> 5) << 2) | (b >> 6)  # top 3 bits of R, top 3 bits of G, top 2 bits of B
 
     @staticmethod
-    def _compress_rgb(rgb: tuple[int, int, int]) -> int:
+    def _compress_hsl(rgb: RGBArray) -> np.ndarray:
         """
-        Convert an RGB tuple (R, G, B) with values in the range 0..255
-        into a single RGB byte in the format RRRGGGBB.
+        Convert an (N, 3) array of RGB values in the range 0..255 into an (N, 2) array of hue and lightness bytes.
+        Only fully saturated hues can be sent, blended towards black (lightness < 128) or white (lightness >= 128).
+        Both blends are fitted by least squares and the one closer to the original color is used.
         """
-        r, g, b = rgb
-        r = (r >> 5) & 0x07  # Take the top 3 bits of R
-        g = (g >> 5) & 0x07  # Take the top 3 bits of G
-        b = (b >> 6) & 0x03  # Take the top 2 bits of B
-        return (r << 5) | (g << 2) | b
+        rgb = rgb.astype(float)
+        r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+        high, low = rgb.max(axis=1), rgb.min(axis=1)
+        chroma = np.where(high > low, high - low, 1.0)
+        degrees = np.select(
+            [high == low, high == r, high == g],
+            [0.0, 60 * (((g - b) / chroma) % 6), 60 * ((b - r) / chroma + 2)],
+            60 * ((r - g) / chroma + 4),
+        )
+        hue = np.rint(degrees * 256 / 360).astype(int) % 256
+        base = _HUE_LUT[hue].astype(float)
+        to_white = 255 - base  # base always has a channel at 0 and one at 255, so neither sum below is 0
+        darker = np.sum(rgb * base, axis=1) / np.sum(base * base, axis=1)
+        lighter = np.sum((rgb - base) * to_white, axis=1) / np.sum(to_white * to_white, axis=1)
+        candidates = (np.clip(np.rint(128 * darker), 0, 127), np.clip(np.rint(128 * lighter) + 128, 128, 255))
+        errors = [np.sum((_uncompress_hsl(hue, lightness.astype(int)) - rgb) ** 2, axis=1) for lightness in candidates]
+        lightness = np.where(errors[0] <= errors[1], *candidates)
+        return np.stack((hue, lightness), axis=1).astype(np.uint8)
+
+    def _on_pixels_changed(self) -> None:
+        self._animation_index = None
+        self._mark_dirty()
 
     def _send_pixel_data(self):
         self._animation_index = None
-        self._send_dmx_packet(self._pack_pixel_bytes())
+        if self.deafened:
+            return
+        self._increment_seq()
+        encoded = self._encode_pixels()
+        packets: list[tuple[int, bytes]] = []
+        for segment in self._segments:
+            segment_pixels = encoded[segment.start:segment.end]
+            delta = self._pack_delta_bytes(segment, segment_pixels) if self._use_delta_frames else None
+            if delta is not None:
+                segment.deltas_since_keyframe += 1
+                packets.append((segment.universe, delta))
+            else:
+                packets.append((segment.universe, self._pack_pixel_bytes(segment_pixels)))
+                segment.set_keyframe(segment_pixels, self._seq)
+        # Every segment is sent in every frame (unchanged ones as empty deltas), so the node knows when a frame is complete
+        self._send_dmx_packets(packets)
 
     def _send_animation_data(self):
+        for segment in self._segments:
+            segment.keyframe = None  # the animation overwrites the pixels on the ESP
         self._send_dmx_packet(self._pack_animation_bytes())
 
-    def _reorder_rgb(self, rgb: tuple[int, int, int]) -> tuple[int, int, int]:
-        return rgb[self._rgb_mapping[0]], rgb[self._rgb_mapping[1]], rgb[self._rgb_mapping[2]]
-
-    def _pack_pixel_bytes(self) -> bytes:
-        if not self._use_compression:
-            return b"\x00" + bytes(value for rgb in self._pixel_proxy for value in self._reorder_rgb(rgb))
-        else:
-            return b"\x00" + bytes(self._compress_rgb(self._reorder_rgb(rgb)) for rgb in self._pixel_proxy)
+    def preview_animation(self, frames: int) -> np.ndarray:
+        """Render the first frames of the current animation as the node does, as a (frames, N, 3) array.
+        The rate and speed are rounded to what fits into the animation header first, like on the node."""
+        if self._animation_index is None:
+            raise ValueError("No animation is set")
+        animation = BaseLEDStrip.ANIMATIONS[self._animation_index]
+        update_rate_ms = int(1000 / self.decode_update_rate(self.encode_update_rate(self._refresh_rate_hz)))
+        speed = self.decode_update_rate(self.encode_update_rate(self._animation_speed))
+        buf = bytearray(3 * len(self))
+        generator = animation(update_rate_ms, buf, speed, self._primary_animation_color, self._secondary_animation_color)
+        preview = np.empty((frames, len(self), 3), dtype=np.uint8)
+        for frame in range(frames):
+            next(generator)
+            preview[frame] = np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3)
+        return preview
+
+    def _reorder_rgb(self, rgb: RGBArray) -> RGBArray:
+        if self._rgb_mapping == (0, 1, 2):
+            return rgb
+        return rgb[:, self._rgb_mapping]
+
+    def _encode_pixels(self) -> np.ndarray:
+        """Returns the pixels as they are sent: an (N, 3) array, an (N, 1) array of RRRGGGBB bytes if compressed, or an
+        (N, 2) array of hue and lightness bytes for "hsl"."""
+        pixels = self._reorder_rgb(self._pixel_array)
+        if self._use_compression == COMPRESSION_HSL:
+            return self._compress_hsl(pixels)
+        if self._use_compression:
+            return self._compress_rgb(pixels)[:, np.newaxis]
+        return pixels
+
+    def _pack_pixel_bytes(self, encoded: np.ndarray | None = None) -> bytes:
+        if encoded is None:
+            encoded = self._encode_pixels()
+        return bytes((FRAME_TYPE_PIXELS,)) + encoded.tobytes()
+
+    def _pack_delta_bytes(self, segment: _Segment, encoded: np.ndarray) -> bytes | None:
+        """Returns a delta frame with all pixels of the segment that changed since its last keyframe, or None if a
+        keyframe is due. Format: FRAME_TYPE_DELTA, keyframe seq, then runs of (u16 BE start pixel, u8 pixel count,
+        pixel data). Start pixels are counted from the start of the strip."""
+        if (segment.keyframe is None
+                or segment.deltas_since_keyframe >= self.MAX_DELTAS_PER_KEYFRAME
+                or time.monotonic() - segment.keyframe_time > self.KEYFRAME_INTERVAL):
+            return None
+        segment.touched |= (encoded != segment.keyframe).any(axis=1)
+        indices = np.flatnonzero(segment.touched)
+        parts: list[bytes] = [bytes((FRAME_TYPE_DELTA, segment.keyframe_seq))]
+        if len(indices):
+            # Bridge gaps that are cheaper to resend than to start a new run for
+            bytes_per_pixel = encoded.shape[1]
+            breaks = np.flatnonzero((np.diff(indices) - 1) * bytes_per_pixel > _DELTA_RUN_HEADER_BYTES)
+            starts = np.concatenate(((indices[0],), indices[breaks + 1]))
+            ends = np.concatenate((indices[breaks], (indices[-1],))) + 1
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                for run_start in range(start, end, 255):
+                    run_end = min(run_start + 255, end)
+                    parts.append(struct.pack(">HB", segment.start + run_start, run_end - run_start))
+                    parts.append(encoded[run_start:run_end].tobytes())
+        frame = b"".join(parts)
+        if len(frame) >= 1 + encoded.size:
+            return None
+        return frame
 
     def __len__(self):
         return len(self._pixel_proxy)
@@ -160,26 +340,33 @@ class LEDStrip(BaseLEDStrip, Fixture):
         return self._pixel_proxy
 
     @pixels.setter
-    def pixels(self, new_pixels: list[tuple[int, int, int]]):
-        if not isinstance(new_pixels, list):
-            raise TypeError("Pixels must be assigned a list of (R, G, B) tuples.")
+    def pixels(self, new_pixels: list[tuple[int, int, int]] | RGBArray):
+        if not isinstance(new_pixels, (list, np.ndarray)):
+            raise TypeError("Pixels must be assigned a list of (R, G, B) tuples or an (N, 3) array.")
         if len(new_pixels) != len(self):
             raise ValueError(f"Pixel list must be exactly {len(self)} items long.")
-        if not all(
-                isinstance(rgb, tuple) and len(rgb) == 3 and all(0 <= val <= 255 for val in rgb) for rgb in new_pixels):
-            raise ValueError("Each pixel must be a tuple of three integers between 0 and 255.")
-        self._pixel_proxy[:] = new_pixels  # Update the existing Pixels proxy in-place so references don't break
+        self._pixel_proxy[:] = new_pixels  # Update the existing array in-place so references don't break
+
+    @property
+    def pixel_array(self) -> RGBArray:
+        """A read-only (N, 3) uint8 view of the pixels. Use set_pixels_array or the pixels proxy to modify them."""
+        view = self._pixel_array.view()
+        view.flags.writeable = False
+        return view
 
     def set_pixel(self, pixel: SupportsIndex, rgb: tuple[int, int, int]):
-        assert isinstance(rgb, tuple) and len(rgb) == 3 and all(0 <= val <= 255 for val in rgb), "Invalid rgb tuple"
         self._pixel_proxy[pixel] = rgb
-        self._send_pixel_data()
 
     def set_pixels(self, pixels: list[tuple[int, int, int]]):
         self.pixels = pixels
 
+    def set_pixels_array(self, pixels: RGBArray, key: SupportsIndex | slice | np.ndarray = slice(None)) -> None:
+        """Set the pixels selected by key (an index, slice, index array or boolean mask) to an (N, 3) array or a
+        single color."""
+        self._pixel_proxy[key] = pixels
+
     def fill(self, color: tuple[int, int, int]):
-        self._pixel_proxy[:] = [color] * len(self)
+        self._pixel_proxy[:] = color
 
     def blackout(self) -> None:
         self.fill((0, 0, 0))
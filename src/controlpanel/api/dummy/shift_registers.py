@@ -1,4 +1,5 @@
 import asyncio
+import struct
 from .sensor import Sensor
 from .fixture import Fixture
 from artnet import ArtNet
@@ -46,11 +47,15 @@ class PisoShiftRegister(Sensor):
     EVENT_TYPES = {
         "ButtonsChanged": tuple[tuple[int, bool], ...],
     }
+    # The node sends either all inputs or only the changed ones, see upy.phys.shift_registers
+    _SNAPSHOT: int = 0
+    _CHANGES: int = 1
 
     def __init__(self, _artnet: ArtNet, _name: str, /, count: int):
         super().__init__(_artnet, _name)
         self._states: list[bool] = [False for _ in range(count * 8)]
         self._real_states: list[bool | None] = [None for _ in range(count * 8)]
+        self._real_bits: int | None = None  # the raw inputs as last reported by the node, bit i is input i
 
     @property
     def desynced(self):
@@ -79,27 +84,60 @@ class PisoShiftRegister(Sensor):
         self.set_state(index, not self._states[index])
 
     def parse_trigger_payload(self, data: bytes, timestamp: float) -> None:
-        num_bits = len(data) * 8
-        assert num_bits <= len(self._states), "Received more bits than expected"
+        if not data:
+            return
+        if data[0] == self._SNAPSHOT:
+            self._apply_snapshot(data[1:])
+        elif data[0] == self._CHANGES:
+            self._apply_changes(data[1:])
+
+    def _apply_snapshot(self, data: bytes) -> None:
+        """Only the inputs that differ from the previous snapshot or change list are applied, so states that were set
+        on the host (set_state) persist until the physical input changes."""
+        assert len(data) * 8 <= len(self._states), "Received more bits than expected"
+        bits = int.from_bytes(data, "little")  # bit i is input i
+        if self._real_bits is None:
+            changed = (1 << len(self._states)) - 1
+        else:
+            changed = bits ^ self._real_bits
+        self._real_bits = bits
+        updates: list[tuple[int, bool]] = []
+        while changed:
+            lowest = changed & -changed
+            changed ^= lowest
+            self._update_real_state(lowest.bit_length() - 1, bool(bits & lowest), updates)
+        if updates:
+            self._fire_event("ButtonsChanged", tuple(updates))
 
+    def _apply_changes(self, data: bytes) -> None:
+        if self._real_bits is None:
+            return  # wait for the first snapshot, the change list is relative to the node's previous read
         updates: list[tuple[int, bool]] = []
-        for byte_index, byte in enumerate(data):
-            base = byte_index * 8
-            # Extract bits directly
-            for bit_index in range(8):
-                index = base + bit_index
-                if index >= len(self._states):
-                    break
-                value = not bool((byte >> bit_index) & 1)
-                self._real_states[index] = value
-                if self._states[index] != value:
-                    self._states[index] = value
-                    updates.append((index, value))
+        for (entry,) in struct.iter_unpack("<H", data):
+            index, bit = entry >> 1, bool(entry & 1)
+            if index >= len(self._states):
+                continue
+            if bit:
+                self._real_bits |= 1 << index
+            else:
+                self._real_bits &= ~(1 << index)
+            self._update_real_state(index, bit, updates)
         if updates:
             self._fire_event("ButtonsChanged", tuple(updates))
 
+    def _update_real_state(self, index: int, bit: bool, updates: list[tuple[int, bool]]) -> None:
+        if index >= len(self._states):
+            return
+        value = not bit  # the inputs are pulled up
+        self._real_states[index] = value
+        if self._states[index] != value:
+            self._states[index] = value
+            updates.append((index, value))
+
 
 class SipoShiftRegister(Fixture):
+    COALESCE_FRAMES = True
+
     def __init__(self,
                  _artnet: ArtNet,
                  _loop: asyncio.AbstractEventLoop,
@@ -109,10 +147,15 @@ class SipoShiftRegister(Fixture):
                  *,
                  universe: int | None = None):
         super().__init__(_artnet, _loop, _esp, name, universe=universe)
-        self._states: _States = _States([False for _ in range(count * 8)], self.send_dmx)
+        self._states: _States = _States([False for _ in range(count * 8)], self._mark_dirty)
 
     def send_dmx(self):
-        self._send_dmx_packet(bytearray(self._states))
+        # One bit per output, LSB first, as the node shifts the bytes out as they are
+        data = bytearray((len(self._states) + 7) // 8)
+        for index, state in enumerate(self._states):
+            if state:
+                data[index >> 3] |= 1 << (index & 7)
+        self._send_dmx_packet(data)
 
     def __len__(self):
         return len(self._states)
@@ -140,7 +183,6 @@ class SipoShiftRegister(Fixture):
 
     def set_state(self, index: SupportsIndex, value: bool):
         self._states[index] = bool(value)
-        self.send_dmx()
 
     def set_states(self, states: list[bool]):
         self.states = states
@@ -156,16 +198,10 @@ class SipoShiftRegister(Fixture):
 
     def randomize(self, weight: float = 0.5):
         weight = min(1.0, max(0.0, weight))
-        for i in range(len(self._states)):
-            self._states[i] = random.random() < weight
-        self.send_dmx()
+        self._states[:] = [random.random() < weight for _ in range(len(self._states))]
 
     def whiteout(self) -> None:
-        for i in range(len(self._states)):
-            self._states[i] = True
-        self.send_dmx()
+        self._states[:] = [True] * len(self._states)
 
     def blackout(self) -> None:
-        for i in range(len(self._states)):
-            self._states[i] = False
-        self.send_dmx()
+        self._states[:] = [False] * len(self._states)
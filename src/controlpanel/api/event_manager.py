@@ -4,7 +4,6 @@ import time
 from threading import Thread
 import asyncio
 import inspect
-from collections import defaultdict
 from controlpanel.shared.base import Device
 from controlpanel.api.dummy import Sensor, Fixture
 import pygame as pg
@@ -17,6 +16,14 @@ from anaconsole import console_command
 from controlpanel import api
 from controlpanel import dmx
 from anaconsole import Autocomplete
+from .frame_scheduler import FrameScheduler
+from .event_queue import EventQueue
+from .callback_executor import CallbackExecutor
+from .tick_scheduler import TickScheduler
+from .subscriber_index import SubscriberIndex
+from .telemetry import StreamTelemetry
+from .latency_monitor import LatencyMonitor
+from .node_registry import NodeRegistry
 from .commons import (
     Event,
     Condition,
@@ -32,18 +39,18 @@ from .commons import (
 
 
 class EventManager:
-    POSSIBLE_EVENT_TYPES = [
-        lambda source, name, value: (source, name, value),
-        lambda source, name, value: (source, name, None),
-        lambda source, name, value: (source, None, value),
-        lambda source, name, value: (source, None, None),
-        lambda source, name, value: (None, name, value),
-        lambda source, name, value: (None, name, None),
-        lambda source, name, value: (None, None, value),
-        lambda source, name, value: (None, None, None),
-    ]
     DEVICE_MANIFEST_FILENAME = 'device_manifest.json'
-    ARTPOLL_INTERVAL: int = 60
+    ARTPOLL_INTERVAL: int = 60  # longest interval between polls, once all nodes are stable
+    MIN_ARTPOLL_INTERVAL: float = 2.0  # poll interval while nodes are missing or flapping
+    ARTPOLL_QUIET_PERIOD: float = 30.0  # how long nodes must be stable before the poll interval grows
+    NODE_SILENCE_TIMEOUT: float = 5.0  # poll right away if a node hasn't been heard from for this long
+    FRAME_RATE_HZ: float = 40.0
+    SYNCHRONOUS_OUTPUT: bool = False  # opt-in, see the sync_output console command
+    EVENT_QUEUE_SIZE: int = 1024
+    CALLBACK_WORKERS_PER_SCRIPT: int = 4
+    LATENCY_PING_INTERVAL: float = 0.5
+    LATENCY_THRESHOLD_MS: float = 100.0
+    COALESCED_EVENT_ACTIONS: frozenset[EventActionType] = frozenset({"ValueRead", "GyroRead"})
 
     def __init__(self, artnet: ArtNet):
         self._artnet: ArtNet = artnet
@@ -53,22 +60,33 @@ class EventManager:
         self.devices: dict[str, Device] = dict()
         self._sensor_dict: dict[str, Sensor] = dict()
         self._fixture_dict: dict[str, Fixture] = dict()
+        self._acknowledged_sensors: set[str] = set()  # sensors whose triggers we acknowledge
+        self._sensor_telemetry: dict[str, StreamTelemetry] = dict()
         self._ip: str = self._get_local_ip()
 
-        self._callback_register: dict[Condition, list[Subscriber]] = defaultdict(list)
-        self._event_queue = asyncio.Queue()
-        self._reply_queue = asyncio.Queue()
-        self._ping_queue = asyncio.Queue()
+        self._nodes: NodeRegistry = NodeRegistry()
+        self._poll_requested: asyncio.Event = asyncio.Event()
+        self._subscribers: SubscriberIndex = SubscriberIndex()
         self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._event_queue: EventQueue = EventQueue(self.loop, self.EVENT_QUEUE_SIZE, self.COALESCED_EVENT_ACTIONS)
         Thread(target=self._run_async_loop, args=(), daemon=True).start()
+        self.frame_scheduler: FrameScheduler = FrameScheduler(self.loop, self._artnet, self.FRAME_RATE_HZ,
+                                                              synchronous=self.SYNCHRONOUS_OUTPUT)
+        self.callback_executor: CallbackExecutor = CallbackExecutor(self.loop, self.CALLBACK_WORKERS_PER_SCRIPT)
+        self.tick_scheduler: TickScheduler = TickScheduler(self.loop, self.callback_executor, self.frame_scheduler)
+        self.latency_monitor: LatencyMonitor = LatencyMonitor(self.loop, self._artnet, self._nodes, self.fire_event,
+                                                              self._on_ping_timeout,
+                                                              interval=self.LATENCY_PING_INTERVAL,
+                                                              threshold_ms=self.LATENCY_THRESHOLD_MS)
+        self.loop.call_soon_threadsafe(self.latency_monitor.start)
 
         self._artpoll_response_future: asyncio.Future | None = None
-        self._nodes: list[ESP32] = list()
 
         self.print_incoming_arttrigger_packets: bool = False
         self.print_incoming_artdmx_packets: bool = False
         self.print_incoming_artcmd_packets: bool = False
         self.print_incoming_artpollreply_packets: bool = False
+        self.print_dispatched_callbacks: bool = False
         self._accept_own_broadcast: bool = False
 
     @console_command
@@ -89,18 +107,16 @@ class EventManager:
 
     async def _ping(self, ip: str, pings: int, timeout: float) -> None:
         print(f"Sending {pings} pings to {ip}...")
+        esp: ESP32 | None = self._nodes.get_by_ip(ip)
         reply_times: list[float] = []
         timeouts: int = 0
         for _ in range(pings):
-            start = time.perf_counter()
-            self._artnet.send_command(b"PING", ip_override=ip)
-            try:
-                while True:
-                    await asyncio.wait_for(self._ping_queue.get(), timeout=timeout)
-                    stop = time.perf_counter()
-                    reply_times.append(stop - start)
-                    break
-            except asyncio.TimeoutError:
+            rtt = await self.latency_monitor.ping(ip, timeout)
+            if esp is not None:
+                esp.telemetry.record_rtt(rtt, timeout)
+            if rtt is not None:
+                reply_times.append(rtt)
+            else:
                 reply_times.append(float("inf"))
                 timeouts += 1
                 if timeouts > len(reply_times) // 2 and len(reply_times) > 5:
@@ -120,80 +136,38 @@ class EventManager:
 
     def _run_async_loop(self):
         self.loop.create_task(self._dispatch_loop())
-        self.loop.create_task(self._poll_loop(self.ARTPOLL_INTERVAL))
+        self.loop.create_task(self._poll_loop())
         self.loop.run_forever()
 
     async def _dispatch_loop(self):
         while True:
-            event = await self._event_queue.get()
-            await self._notify_subscribers(event)
+            for event in await self._event_queue.get_batch():
+                await self._notify_subscribers(event)
 
-    async def _poll_and_collect(self, timeout=3.0) -> list[dict[str, Any]]:
-        replies: list[dict[str, Any]] = []
-        end_time = asyncio.get_running_loop().time() + timeout
-        self._artnet.send_poll()
+    async def _poll_loop(self):
+        """Poll often while nodes are missing or flapping, and back off exponentially once they are stable.
+        A poll is sent early when requested, e.g. because a node stopped answering pings."""
+        interval = self.MIN_ARTPOLL_INTERVAL
         while True:
-            remaining = end_time - asyncio.get_running_loop().time()
-            if remaining <= 0:
-                break
+            await self._poll()
+            self._poll_requested.clear()
+            await asyncio.sleep(self.MIN_ARTPOLL_INTERVAL)  # give every node time to reply before the next poll
             try:
-                reply: dict[str, Any] = await asyncio.wait_for(self._reply_queue.get(), timeout=min(remaining, 0.1))
-                replies.append(reply)
+                await asyncio.wait_for(self._poll_requested.wait(), timeout=interval - self.MIN_ARTPOLL_INTERVAL)
             except asyncio.TimeoutError:
                 pass
-        return replies
-
-    def _handle_artpoll_replies(self, replies: list[dict[str, Any]]) -> None:
-        collected_mac_addresses: set[str] = set()  # a set of all MAC addresses from nodes that replied to our poll
-        for reply in replies:
-            name: str = reply['ShortName']
-            mac: str = reply['Mac']
-            collected_mac_addresses.add(mac)
-            if mac not in (esp.mac for esp in self._nodes):
-                if name not in (esp.name for esp in self._nodes):
-                    print(f"Unknown ESP '{name}' with mac {mac} has been registered")
-                    esp = ESP32(name)
-                    esp.mac = mac
-                    esp.ip = reply["IpAddress"]
-                    esp.status = reply['NodeReport']
-                    self._nodes.append(esp)
-                else:
-                    esp = next((esp for esp in self._nodes if esp.name == name))
-                    esp.mac = mac
-                    esp.ip = reply["IpAddress"]
-                    esp.status = reply['NodeReport']
-                    esp.subsequent_missed_replies = 0
-                    print(f"ESP '{name}' with mac {mac} connected for the first time")
+            if self._nodes.is_settled(self.ARTPOLL_QUIET_PERIOD):
+                interval = min(2 * interval, self.ARTPOLL_INTERVAL)
             else:
-                esp = next((esp for esp in self._nodes if esp.mac == mac), None)
-                if esp.subsequent_missed_replies > 0:
-                    print(f"ESP '{esp.name}' has regained the connection!")
-                esp.name = name
-                esp.ip = reply['IpAddress']
-                esp.status = reply['NodeReport']
-                esp.subsequent_missed_replies = 0
-        for esp in self._nodes:
-            if esp.status == "Lost connection!" or esp.status == "Never connected":
-                continue
-            if esp.mac not in collected_mac_addresses:
-                esp.subsequent_missed_replies += 1
-                print(f"ESP '{esp.name}' failed to reply! ({esp.subsequent_missed_replies} missed repl{'ies' if esp.subsequent_missed_replies > 1 else 'y'})")
-                if esp.subsequent_missed_replies >= 3:
-                    print(f"ESP '{esp.name}' lost the connection!")
-                    esp.status = 'Lost connection!'
-
-    async def _poll_loop(self, poll_interval_seconds: int = 10):
-        while True:
-            await self._poll()
-            for _ in range(poll_interval_seconds):
-                await asyncio.sleep(1)
+                interval = self.MIN_ARTPOLL_INTERVAL
+
+    def _on_ping_timeout(self, esp: ESP32) -> None:
+        if esp.last_seen is None or time.monotonic() - esp.last_seen > self.NODE_SILENCE_TIMEOUT:
+            self._poll_requested.set()
 
     async def _poll(self):
+        self._nodes.end_poll_round()
         self._artnet.send_poll()
-        replies: list[dict[str, Any]] = []
-        while not self._reply_queue.empty():
-            replies.append(self._reply_queue.get_nowait())
-        self._handle_artpoll_replies(replies)
 
     @staticmethod
     def _get_local_ip() -> str:
@@ -223,9 +197,8 @@ class EventManager:
 
         universe = start_universe
         for node_name, node_config in manifest.items():
-            if not node_name in (node.name for node in self._nodes):
-                self._nodes.append(ESP32(node_name))
-            esp = next((esp for esp in self._nodes if esp.name == node_name), None)
+            esp = self._nodes.get_or_add(node_name)
+            esp.acknowledge = node_config.get("acknowledge", False)
             for device_name, (class_name, phys_kwargs, dummy_kwargs) in node_config["devices"].items():
                 kwargs = phys_kwargs | dummy_kwargs
                 cls = find_class_in_modules(libs, class_name)
@@ -255,7 +228,12 @@ class EventManager:
 
         self.devices = {name: device for esp in self._nodes for name, device in esp.devices.items()}
         self._sensor_dict = {name: device for name, device in self.devices.items() if isinstance(device, Sensor)}
-        self._fixture_dict = {device.universe: device for device in self.devices.values() if isinstance(device, Fixture)}
+        self._fixture_dict = {universe: device for device in self.devices.values() if isinstance(device, Fixture)
+                              for universe in device.universes}
+        self._acknowledged_sensors = {name for esp in self._nodes if esp.acknowledge
+                                      for name, device in esp.devices.items() if isinstance(device, Sensor)}
+        self._sensor_telemetry = {name: esp.telemetry.add_stream(name) for esp in self._nodes
+                                  for name, device in esp.devices.items() if isinstance(device, Sensor)}
 
     def _parse_trigger(self, reply: dict[str, Any], sender: tuple[str, int], ts: float):
         if self.print_incoming_arttrigger_packets:
@@ -278,6 +256,10 @@ class EventManager:
             return
 
         seq = reply.get("SubKey")
+        self._sensor_telemetry[sensor_name].record(seq, ts)
+        if sensor_name in self._acknowledged_sensors:
+            # Acknowledge duplicates too, as the previous acknowledgement may have been lost
+            self._artnet.send_command(f"ACK {sensor_name} {seq}".encode("ascii"), ip_override=sender[0])
         if sensor.should_ignore_seq(seq):
             return
         sensor._seq = seq
@@ -300,13 +282,34 @@ class EventManager:
     def _parse_artpollreply(self, reply: dict[str, Any], sender: tuple[str, int], ts: float) -> None:
         if self.print_incoming_artpollreply_packets:
             print(f"Receiving ArtPollReply event from {sender[0]}: {reply}")
-        self.loop.call_soon_threadsafe(self._reply_queue.put_nowait, reply)
+        self.loop.call_soon_threadsafe(self._nodes.handle_reply, reply)
 
     def _parse_artcmd(self, reply: dict[str, Any], sender: tuple[str, int], ts: float) -> None:
         if self.print_incoming_artcmd_packets:
             print(f"Receiving ArtCommand event from {sender[0]}: {reply.get('Command')}")
-        if reply.get("Command") == "RETURN_PING":
-            self.loop.call_soon_threadsafe(self._ping_queue.put_nowait, reply.get("Command"))
+        command: str = reply.get("Command", "")
+        if command.startswith("RETURN_PING"):
+            self._parse_return_ping(command, sender)
+        elif command.startswith("ACK "):
+            self._parse_ack(command)
+
+    def _parse_return_ping(self, command: str, sender: tuple[str, int]) -> None:
+        """Handle a 'RETURN_PING <nonce>' command a node sends in reply to 'PING <nonce>'."""
+        received = time.perf_counter()
+        _, _, nonce = command.partition(" ")
+        self.loop.call_soon_threadsafe(self.latency_monitor.resolve, int(nonce) if nonce.isdigit() else None,
+                                       sender[0], received)
+
+    def _parse_ack(self, command: str) -> None:
+        """Handle an 'ACK <universe> <seq>' command a node sends for every DMX packet it received."""
+        try:
+            _, universe, seq = command.split(" ")
+            universe, seq = int(universe), int(seq)
+        except ValueError:
+            return
+        fixture: Fixture | None = self._fixture_dict.get(universe)
+        if fixture is not None:
+            self.loop.call_soon_threadsafe(fixture.acknowledge, universe, seq)
 
     def _parse_op(self, sender: tuple[str, int], ts: float, op_code: OpCode, reply: dict[str, Any]) -> None:
         match op_code:
@@ -331,15 +334,14 @@ class EventManager:
             IPv4Address(name_or_ip)
             return name_or_ip
         except ValueError:
-            try:
-                ip: str | None = next((esp for esp in self._nodes if esp.name == name_or_ip)).ip
-                if not ip:
-                    print(f"Node '{name_or_ip}' has no registered IP address.")
-                    return None
-                return ip
-            except StopIteration:
+            esp = self._nodes.get(name_or_ip)
+            if esp is None:
                 print(f"{name_or_ip} is neither a valid IPv4 address nor the name of a registered ArtNet node")
                 return None
+            if not esp.ip:
+                print(f"Node '{name_or_ip}' has no registered IP address.")
+                return None
+            return esp.ip
 
     def _sensor_autocomplete(self, text: str) -> tuple[int, list[Autocomplete.Option]]:
         return 0, [Autocomplete.Option(sensor, "") for sensor in self._sensor_dict.keys() if sensor.startswith(text)]
@@ -405,6 +407,8 @@ class EventManager:
             api.send_dmx(device_name_or_universe, data)
         elif type(device_name_or_universe) is int and 0 <= device_name_or_universe < 2**15:
             self._artnet.send_dmx(device_name_or_universe, 0, bytearray(data))
+            if self.frame_scheduler.synchronous:
+                self.frame_scheduler.request_sync()  # nodes in sync mode would hold the data back otherwise
 
     @console_command(is_cheat_protected=True)
     def send_arttrigger(self, key: int, subkey: int, data: str):
@@ -418,17 +422,125 @@ class EventManager:
 
     @console_command(is_cheat_protected=True)
     def poll(self):
-        self.loop.create_task(self._poll())
+        self.loop.call_soon_threadsafe(self._poll_requested.set)
 
     @console_command(is_cheat_protected=True)
     def set_dmx_attr(self, device_name: str, attribute: str, value):
         """Sets any attribute of any DMX device to any value"""
         setattr(api.dmx.devices.get(device_name), attribute, value)
 
+    @console_command
+    def event_queue_stats(self) -> None:
+        """Print statistics about the incoming event queue"""
+        queue = self._event_queue
+        print(f"Pending: {len(queue)}/{queue.max_size} (max {queue.max_depth}) | Received: {queue.received} | "
+              f"Coalesced: {queue.coalesced} | Dropped: {queue.dropped}")
+
+    @console_command
+    def callback_stats(self) -> None:
+        """Print queue depth and throughput of the callback thread pools"""
+        for script, stats in sorted(self.callback_executor.stats.items()):
+            print(f"{script:<24} Pending: {stats.pending:>3} (max {stats.max_pending:>3}) | "
+                  f"Completed: {stats.completed:>6} | Failed: {stats.failed:>4} | Busy: {stats.busy_time:.1f}s")
+
+    @console_command
+    def tick_stats(self) -> None:
+        """Print run and overrun counts of all periodic functions"""
+        for task in self.tick_scheduler.tasks:
+            print(f"{task.name:<40} {task.frequency:>6.1f} Hz | Runs: {task.runs:>7} | Overruns: {task.overruns:>5} | "
+                  f"Missed: {task.missed:>5} | Max: {1000 * task.max_duration:.1f}ms")
+
+    @console_command
+    def link_stats(self) -> None:
+        """Print the estimated packet loss of all nodes that acknowledge packets"""
+        for esp in self._nodes:
+            if not esp.acknowledge:
+                continue
+            link = esp.link
+            print(f"{esp.name:<20} Loss: {100 * link.loss:5.1f}% | Sent: {link.sent:>7} | Acknowledged: "
+                  f"{link.acknowledged:>7} | Retransmitted: {link.retransmitted:>6} | Retransmits: {link.retransmits()}")
+
+    def telemetry_snapshot(self) -> dict[str, Any]:
+        """Packet loss, jitter and round trip times of all nodes and their sensors, keyed by node name"""
+        now = time.monotonic()
+        return {esp.name: {"ip": esp.ip, "state": esp.state.value, "status": esp.status,
+                           "seconds_since_seen": None if esp.last_seen is None else now - esp.last_seen}
+                | esp.telemetry.snapshot() for esp in self._nodes}
+
+    def _node_autocomplete(self, text: str) -> tuple[int, list[Autocomplete.Option]]:
+        return 0, [Autocomplete.Option(esp.name, "") for esp in self._nodes if esp.name.startswith(text)]
+
+    @console_command
+    def nodes(self) -> None:
+        """List all known nodes with their connection state"""
+        now = time.monotonic()
+        for esp in self._nodes:
+            last_seen = f"{now - esp.last_seen:.0f}s ago" if esp.last_seen is not None else "never"
+            print(f"{esp.name:<20} {esp.state.value:<18} IP: {esp.ip or '-':<16} MAC: {esp.mac or '-':<18} "
+                  f"Last seen: {last_seen}")
+
+    @console_command(autocomplete_function=_node_autocomplete)
+    def telemetry(self, node_name: str | None = None) -> None:
+        """Print packet loss, jitter and ping round trip times per node, or per sensor of the given node"""
+        if node_name is None:
+            for esp in sorted(self._nodes, key=lambda esp: esp.telemetry.loss_rate, reverse=True):
+                t = esp.telemetry
+                rtt = f"{1000 * t.rtt.max:.0f}ms" if t.rtt.max is not None else "-"
+                print(f"{esp.name:<20} Loss: {100 * t.loss_rate:5.1f}% | Received: {t.received:>7} | Lost: {t.lost:>5} | "
+                      f"Dup: {t.duplicates:>6} | Late: {t.out_of_order:>4} | Jitter: {1000 * t.jitter:6.1f}ms | "
+                      f"Pings: {t.rtt.replies}/{t.rtt.replies + t.rtt.timeouts} (max {rtt})")
+            return
+        esp = self._nodes.get(node_name)
+        if esp is None:
+            print(f"'{node_name}' is not the name of a registered ArtNet node")
+            return
+        for name, stream in esp.telemetry.streams.items():
+            print(f"{name:<24} Loss: {100 * stream.loss_rate:5.1f}% | Received: {stream.received:>7} | "
+                  f"Lost: {stream.lost:>5} | Dup: {stream.duplicates:>6} | Late: {stream.out_of_order:>4} | "
+                  f"Jitter: {1000 * stream.jitter:6.1f}ms")
+        rtt = esp.telemetry.rtt
+        print("RTT: " + " | ".join(f"{label}: {count}" for label, count in rtt.snapshot()["histogram"].items())
+              + f" | Timeouts: {rtt.timeouts} | Jitter: {1000 * rtt.jitter:.1f}ms")
+
+    @console_command
+    def telemetry_dump(self, path: str = "telemetry.json") -> None:
+        """Write the telemetry of all nodes to a JSON file"""
+        with open(path, "w") as file:
+            json.dump({"timestamp": time.time(), "nodes": self.telemetry_snapshot()}, file, indent=2)
+        print(f"Wrote telemetry of {len(self._nodes)} nodes to '{path}'.")
+
+    @console_command
+    def telemetry_reset(self) -> None:
+        """Reset the telemetry of all nodes"""
+        for esp in self._nodes:
+            esp.telemetry.reset()
+
+    @console_command("latency_monitor")
+    def set_enable_latency_monitor(self, enable: int, threshold_ms: float | None = None):
+        """Continuously ping all nodes in the background and fire LatencyHigh events above the threshold"""
+        self.latency_monitor.enabled = bool(enable)
+        if threshold_ms is not None:
+            self.latency_monitor.threshold_ms = threshold_ms
+
+    @console_command("frame_rate")
+    def set_frame_rate(self, frame_rate_hz: float) -> None:
+        """Sets the rate at which changes to frame-coalescing fixtures are sent out"""
+        try:
+            self.frame_scheduler.frame_rate_hz = frame_rate_hz
+        except ValueError as e:
+            print(e)
+            return
+        print(f"Flushing fixtures at {frame_rate_hz} Hz.")
+
     @console_command("arttrigger_debug")
     def set_enable_print_arttrigger_packets(self, enable: int):
         self.print_incoming_arttrigger_packets = bool(enable)
 
+    @console_command("sync_output")
+    def set_enable_synchronous_output(self, enable: int):
+        """Follow DMX data with an ArtSync, so that nodes output all universes at the same time"""
+        self.frame_scheduler.synchronous = bool(enable)
+
     @console_command("artdmx_debug")
     def set_enable_print_artdmx_packets(self, enable: int):
         self.print_incoming_artdmx_packets = bool(enable)
@@ -441,6 +553,10 @@ class EventManager:
     def set_enable_print_artpollreply_packets(self, enable: int):
         self.print_incoming_artpollreply_packets = bool(enable)
 
+    @console_command("callback_debug")
+    def set_enable_print_dispatched_callbacks(self, enable: int):
+        self.print_dispatched_callbacks = bool(enable)
+
     @console_command("accept_own_broadcast")
     def set_enable_accept_own_broadcast(self, enable: int):
         self._accept_own_broadcast = bool(enable)
@@ -457,35 +573,62 @@ class EventManager:
         event = Event(source, action, value, sender, ts)
         print(f"{'Firing event:':<16}{event.source:<20} -> {event.action:<20} -> {str(event.value):<20} from {event.sender}")
         pg.event.post(pg.event.Event(CONTROL_PANEL_EVENT, source=event.source, name=event.action, value=event.value, sender=event.sender))
-        asyncio.run_coroutine_threadsafe(self._event_queue.put(event), self.loop)
+        self._event_queue.put(event)
 
     async def _notify_subscribers(self, event: Event) -> None:
-        for key_func in self.POSSIBLE_EVENT_TYPES:
-            source, name, value = key_func(event.source, event.action, event.value)
-            subscribers: list[Subscriber] = self._callback_register.get(Condition(source, name, value), [])
-            for subscriber in subscribers:
-                if not subscriber.allow_parallelism:
-                    if subscriber.task is not None and not subscriber.task.done():
-                        print(f"[EventManager] Skipping {subscriber.callback.__name__}: still running.")
+        subscribers: list[Subscriber] = self._subscribers.resolve(event.source, event.action, event.value)
+        for subscriber in subscribers:
+            if not subscriber.allow_parallelism:
+                if subscriber.task is not None and not subscriber.task.done():
+                    if subscriber.coalesce:
+                        subscriber.pending_events.pop(event.source, None)  # re-insert to keep arrival order
+                        subscriber.pending_events[event.source] = event
                         continue
-                print(f"{'Event received: ':<16}{subscriber.callback.__module__.rsplit('.')[-1]}.{subscriber.callback.__name__}")
+                    if self.print_dispatched_callbacks:
+                        print(f"[EventManager] Skipping {subscriber.callback.__name__}: still running.")
+                    continue
+            self._invoke(subscriber, event)
 
-                if inspect.iscoroutinefunction(subscriber.callback):
-                    if subscriber.requires_event_arg:
-                        task = asyncio.create_task(subscriber.callback(event))
-                    else:
-                        task = asyncio.create_task(subscriber.callback())
-                    subscriber.task = task
+            if subscriber.fire_once:
+                self._subscribers.remove(subscriber)
+
+    def _invoke(self, subscriber: Subscriber, event: Event) -> None:
+        if self.print_dispatched_callbacks:
+            print(f"{'Event received: ':<16}{subscriber.callback.__module__.rsplit('.')[-1]}.{subscriber.callback.__name__}")
+
+        if inspect.iscoroutinefunction(subscriber.callback):
+            if subscriber.requires_event_arg:
+                task = asyncio.create_task(subscriber.callback(event))
+            else:
+                task = asyncio.create_task(subscriber.callback())
+            subscriber.task = task
+        elif subscriber.inline:
+            # Fast sync functions run directly on the loop, no other callback is dispatched until they return
+            subscriber.task = None
+            try:
+                if subscriber.requires_event_arg:
+                    subscriber.callback(event)
                 else:
-                    # Run sync function in a thread, wrap it in a future
-                    if subscriber.requires_event_arg:
-                        task = asyncio.to_thread(subscriber.callback, event)
-                    else:
-                        task = asyncio.to_thread(subscriber.callback)
-                    subscriber.task = asyncio.create_task(task)
+                    subscriber.callback()
+            except Exception as e:
+                print(f"[EventManager] {subscriber.callback.__name__} raised {e!r}")
+            return
+        else:
+            # Run sync function in the thread pool of its script
+            if subscriber.requires_event_arg:
+                subscriber.task = self.callback_executor.submit(subscriber.callback, event)
+            else:
+                subscriber.task = self.callback_executor.submit(subscriber.callback)
+
+        if subscriber.coalesce:
+            subscriber.task.add_done_callback(lambda _: self._invoke_pending(subscriber))
 
-                if subscriber.fire_once:
-                    subscribers.remove(subscriber)
+    def _invoke_pending(self, subscriber: Subscriber) -> None:
+        """Run the subscriber with the oldest of its pending events, which is the newest event of that source."""
+        if not subscriber.pending_events:
+            return
+        source = next(iter(subscriber.pending_events))
+        self._invoke(subscriber, subscriber.pending_events.pop(source))
 
     def _receive(self, op_code: OpCode, ip: str, port: int, reply: Any) -> None:
         if ip == self._ip and not self._accept_own_broadcast:
@@ -501,10 +644,17 @@ class EventManager:
                   value: EventValueType = None,
                   *,
                   fire_once: bool = False,
-                  allow_parallelism: bool = False) -> None:
+                  allow_parallelism: bool = False,
+                  coalesce: bool = False,
+                  inline: bool = False) -> None:
+        """Subscribe the callback to all events matching the condition.
+        If coalesce is set and the callback is still running when a new event arrives, only the newest event per
+        source is kept and passed to the callback once it has finished. Stale events are discarded."""
+        if coalesce and allow_parallelism:
+            raise ValueError("coalesce and allow_parallelism are mutually exclusive")
         arg_count = callback.__code__.co_argcount
         is_method = inspect.ismethod(callback)
         requires_event_arg = arg_count == 1 if not is_method else arg_count == 2
-        subscriber = Subscriber(callback, fire_once, allow_parallelism, requires_event_arg)
         condition = Condition(source, action, value)
-        self._callback_register[condition].append(subscriber)
+        subscriber = Subscriber(callback, condition, fire_once, allow_parallelism, requires_event_arg, coalesce, inline)
+        self._subscribers.add(subscriber)
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Iterable
+from .commons import Event, EventSourceType, EventActionType
+
+
+class EventQueue:
+    """Collects events from any thread and hands them to the event loop in batches.
+    Producers only wake the loop if it is not already scheduled to drain the queue, so a burst of events costs a single
+    wakeup. Events whose action is in coalesce_actions occupy at most one slot per (source, action): a newer event
+    replaces the pending one in place. Once max_size events are pending, further events are dropped and counted."""
+
+    def __init__(self,
+                 loop: asyncio.AbstractEventLoop,
+                 max_size: int = 1024,
+                 coalesce_actions: Iterable[EventActionType] = ()) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        # Coalesced events are represented by their (source, action) key, the event itself is stored in _latest
+        self._pending: deque[Event | tuple[EventSourceType, EventActionType]] = deque()
+        self._latest: dict[tuple[EventSourceType, EventActionType], Event] = {}
+        self._lock = threading.Lock()
+        self._wakeup_scheduled: bool = False
+        self._ready = asyncio.Event()
+        self.max_size: int = max_size
+        self.coalesce_actions: set[EventActionType] = set(coalesce_actions)
+
+        self.received: int = 0
+        self.coalesced: int = 0
+        self.dropped: int = 0
+        self.max_depth: int = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, event: Event) -> bool:
+        """Enqueue the event. Thread-safe. Returns False if the event had to be dropped."""
+        key = (event.source, event.action)
+        coalesce = event.action in self.coalesce_actions
+        with self._lock:
+            self.received += 1
+            if coalesce and key in self._latest:
+                self._latest[key] = event
+                self.coalesced += 1
+                return True
+            if len(self._pending) >= self.max_size:
+                self.dropped += 1
+                return False
+            if coalesce:
+                self._latest[key] = event
+                self._pending.append(key)
+            else:
+                self._pending.append(event)
+            self.max_depth = max(self.max_depth, len(self._pending))
+            if self._wakeup_scheduled:
+                return True
+            self._wakeup_scheduled = True
+        self._loop.call_soon_threadsafe(self._ready.set)
+        return True
+
+    async def get_batch(self) -> list[Event]:
+        """Wait until events are available, then return all of them in the order they were received."""
+        await self._ready.wait()
+        self._ready.clear()
+        with self._lock:
+            self._wakeup_scheduled = False
+            pending, self._pending = self._pending, deque()
+            return [self._latest.pop(item) if isinstance(item, tuple) else item for item in pending]
@@ -0,0 +1,117 @@
+import asyncio
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+if TYPE_CHECKING:
+    from artnet import ArtNet
+    from controlpanel.api.dummy import Fixture
+
+
+class FrameScheduler:
+    """Coalesces fixture updates into frames.
+    Fixtures mark themselves as dirty instead of sending right away. On every tick of the frame clock, each dirty fixture
+    is flushed exactly once, no matter how often it was modified in between. Thread-safe: fixtures may be marked dirty
+    from any thread, flushing always happens on the event loop.
+    In synchronous mode (opt-in), every transmission of DMX data is followed by an ArtSync, so the nodes output all universes at
+    the same time. Fixtures flushed in the same frame share a single ArtSync that is sent after all of them.
+    Retransmits don't get an ArtSync of their own, they are sent with the next frame (see defer_send)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, artnet: "ArtNet", frame_rate_hz: float = 40.0, *,
+                 synchronous: bool = False) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._artnet: "ArtNet" = artnet
+        self.synchronous: bool = synchronous
+        self._flushing: bool = False
+        self._sync_requested: bool = False
+        self._frame_interval: float = 1 / frame_rate_hz
+        self._origin: float = time.monotonic()  # all frames are aligned to this point in time
+        self._dirty: dict["Fixture", None] = {}  # used as an insertion-ordered set
+        self._deferred: list[Callable[[], None]] = []  # sends that go out with the next frame, see defer_send
+        self._lock = threading.Lock()
+        self._flush_pending: bool = False
+        self.frames_flushed: int = 0
+        self.syncs_sent: int = 0
+
+    @property
+    def frame_rate_hz(self) -> float:
+        return 1 / self._frame_interval
+
+    @frame_rate_hz.setter
+    def frame_rate_hz(self, frame_rate_hz: float) -> None:
+        if frame_rate_hz <= 0:
+            raise ValueError("Frame rate must be positive")
+        self._frame_interval = 1 / frame_rate_hz
+
+    @property
+    def frame_interval(self) -> float:
+        return self._frame_interval
+
+    def next_frame_time(self, now: float | None = None) -> float:
+        """Returns the time.monotonic() timestamp of the next frame boundary after now."""
+        if now is None:
+            now = time.monotonic()
+        frames_elapsed = math.floor((now - self._origin) / self._frame_interval) + 1
+        return self._origin + frames_elapsed * self._frame_interval
+
+    def mark_dirty(self, fixture: "Fixture") -> None:
+        with self._lock:
+            self._dirty[fixture] = None
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        self._loop.call_soon_threadsafe(self._schedule_flush)
+
+    def defer_send(self, send: Callable[[], None]) -> None:
+        """Call send, which transmits DMX data, at the start of the next frame, so that frame's ArtSync latches it
+        together with everything else. Thread-safe."""
+        with self._lock:
+            self._deferred.append(send)
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        self._loop.call_soon_threadsafe(self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        delay = self.next_frame_time() - time.monotonic()
+        self._loop.call_later(max(0.0, delay), self._flush)
+
+    def request_sync(self) -> None:
+        """Send an ArtSync after DMX data has been sent. Thread-safe. During a flush, the ArtSync is deferred until all
+        dirty fixtures have been sent."""
+        with self._lock:
+            if self._flushing:
+                self._sync_requested = True
+                return
+        self._send_sync()
+
+    def _send_sync(self) -> None:
+        self._artnet.send_sync()
+        self.syncs_sent += 1
+
+    def _flush(self) -> None:
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            deferred, self._deferred = self._deferred, []
+            self._flush_pending = False
+            self._flushing = True
+            self._sync_requested = bool(deferred) and self.synchronous
+        try:
+            # Deferred retransmits go first, so the new data of a fixture is always sent after its older data
+            for send in deferred:
+                try:
+                    send()
+                except Exception as e:
+                    print(f"[FrameScheduler] Failed to send deferred data: {e}")
+            for fixture in dirty:
+                try:
+                    fixture.send_dmx()
+                except Exception as e:
+                    print(f"[FrameScheduler] Failed to flush {fixture.name}: {e}")
+        finally:
+            with self._lock:
+                self._flushing = False
+                sync_requested, self._sync_requested = self._sync_requested, False
+        if sync_requested:
+            self._send_sync()
+        self.frames_flushed += 1
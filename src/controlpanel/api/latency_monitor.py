@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import time
+from typing import Callable, Iterable
+from artnet import ArtNet
+from controlpanel.api.dummy.esp32 import ESP32, NodeState
+from .commons import EventSourceType, EventActionType, EventValueType
+
+
+class LatencyMonitor:
+    """Measures the round trip time to all connected nodes in the background.
+    Nodes are pinged round-robin, one ping per interval, so the network load stays constant no matter how many nodes
+    there are. Every ping carries a nonce that the node echoes back, so replies are matched to the ping they belong to,
+    even if several pings are in flight. If the 95th percentile of a node's recent round trip times exceeds the
+    threshold, a LatencyHigh event is fired with the node as source and the percentile in ms as value, and a
+    LatencyNormal event once it has recovered."""
+
+    PERCENTILE: float = 95.0
+    RECOVERY_FACTOR: float = 0.8  # hysteresis, so a node hovering around the threshold doesn't fire an event every ping
+    MIN_SAMPLES: int = 10  # don't judge a node by its first few pings
+
+    def __init__(self,
+                 loop: asyncio.AbstractEventLoop,
+                 artnet: ArtNet,
+                 nodes: Iterable[ESP32],
+                 fire_event: Callable[[EventSourceType, EventActionType, EventValueType], None],
+                 on_timeout: Callable[[ESP32], None] | None = None,
+                 *,
+                 interval: float = 0.5,
+                 timeout: float = 1.0,
+                 threshold_ms: float = 100.0) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._artnet: ArtNet = artnet
+        self._nodes: Iterable[ESP32] = nodes
+        self._fire_event: Callable[[EventSourceType, EventActionType, EventValueType], None] = fire_event
+        self._on_timeout: Callable[[ESP32], None] | None = on_timeout
+        self.interval: float = interval
+        self.timeout: float = timeout
+        self.threshold_ms: float = threshold_ms
+        self.enabled: bool = True
+        self._nonces = itertools.count(1)
+        self._pending: dict[int, tuple[str, float, asyncio.Future]] = {}  # nonce -> ip, time.perf_counter(), future
+        self._in_flight: set[str] = set()  # names of the nodes the monitor is currently waiting for
+        self._degraded: set[str] = set()  # names of the nodes whose latency is above the threshold
+        self._next_node: int = 0
+
+    def start(self) -> None:
+        self._loop.create_task(self._run())
+
+    async def ping(self, ip: str, timeout: float) -> float | None:
+        """Send a single ping and return its round trip time in seconds, or None if it timed out.
+        Must be called on the event loop."""
+        nonce = next(self._nonces) % 2**16
+        future = self._loop.create_future()
+        self._pending[nonce] = (ip, time.perf_counter(), future)
+        self._artnet.send_command(f"PING {nonce}".encode("ascii"), ip_override=ip)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(nonce, None)
+
+    def resolve(self, nonce: int | None, ip: str, received: float) -> None:
+        """Called on the event loop for every RETURN_PING, with the time.perf_counter() at which it was received.
+        Replies without a nonce, from nodes that don't echo it, are matched to the oldest ping to that node."""
+        if nonce is None:
+            nonce = next((key for key, (pending_ip, _, _) in self._pending.items() if pending_ip == ip), None)
+        if nonce not in self._pending:
+            return  # timed out already
+        _, sent, future = self._pending.pop(nonce)
+        if not future.done():
+            future.set_result(received - sent)
+
+    def is_degraded(self, esp: ESP32) -> bool:
+        return esp.name in self._degraded
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.enabled:
+                continue
+            nodes = [esp for esp in self._nodes if esp.ip and esp.state in (NodeState.ONLINE, NodeState.MISSING)]
+            if not nodes:
+                continue
+            self._next_node %= len(nodes)
+            esp = nodes[self._next_node]
+            self._next_node += 1
+            if esp.name not in self._in_flight:
+                self._loop.create_task(self._measure(esp))
+
+    async def _measure(self, esp: ESP32) -> None:
+        self._in_flight.add(esp.name)
+        try:
+            rtt = await self.ping(esp.ip, self.timeout)
+        finally:
+            self._in_flight.discard(esp.name)
+        esp.telemetry.record_rtt(rtt, self.timeout)
+        if rtt is not None:
+            esp.last_seen = time.monotonic()
+        elif self._on_timeout is not None:
+            self._on_timeout(esp)
+        self._evaluate(esp)
+
+    def _evaluate(self, esp: ESP32) -> None:
+        window = esp.telemetry.rtt_window
+        if len(window) < self.MIN_SAMPLES:
+            return
+        percentile_ms = 1000 * window.percentile(self.PERCENTILE)
+        if esp.name not in self._degraded and percentile_ms > self.threshold_ms:
+            self._degraded.add(esp.name)
+            self._fire_event(esp.name, "LatencyHigh", round(percentile_ms))
+        elif esp.name in self._degraded and percentile_ms < self.RECOVERY_FACTOR * self.threshold_ms:
+            self._degraded.discard(esp.name)
+            self._fire_event(esp.name, "LatencyNormal", round(percentile_ms))
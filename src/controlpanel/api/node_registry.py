@@ -0,0 +1,121 @@
+import time
+from typing import Any, Iterator
+from controlpanel.api.dummy.esp32 import ESP32, NodeState
+
+
+class NodeRegistry:
+    """All known ESP32 nodes, indexed by name, MAC and IP address.
+    ArtPollReplies are applied one at a time as they arrive. A node that fails to reply to several polls in a row is
+    considered lost:
+    NEVER_CONNECTED -> ONLINE on its first reply, ONLINE -> MISSING on a missed poll, MISSING -> LOST after
+    MISSED_REPLIES_UNTIL_LOST missed polls in a row, MISSING/LOST -> ONLINE on the next reply.
+    Replies are applied on the event loop. Iterating over the registry is safe from any thread."""
+
+    MISSED_REPLIES_UNTIL_LOST: int = 3
+
+    def __init__(self) -> None:
+        self._by_name: dict[str, ESP32] = {}
+        self._by_mac: dict[str, ESP32] = {}
+        self._by_ip: dict[str, ESP32] = {}
+        self._replied: set[str] = set()  # MAC addresses of the nodes that replied since the last poll
+        self.last_transition: float = 0.0  # time.monotonic() of the last time a node went missing or came back
+
+    def __iter__(self) -> Iterator[ESP32]:
+        return iter(list(self._by_name.values()))  # allow modifications while iterating
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> ESP32 | None:
+        return self._by_name.get(name)
+
+    def get_by_mac(self, mac: str) -> ESP32 | None:
+        return self._by_mac.get(mac)
+
+    def get_by_ip(self, ip: str) -> ESP32 | None:
+        esp = self._by_ip.get(ip)
+        if esp is not None and esp.ip == ip:
+            return esp
+        # The IP may have been assigned directly instead of through set_ip
+        esp = next((esp for esp in self._by_name.values() if esp.ip == ip), None)
+        if esp is not None:
+            self._by_ip[ip] = esp
+        return esp
+
+    def is_settled(self, quiet_period: float) -> bool:
+        """Whether no node is missing and no node went missing or came back within the last quiet_period seconds."""
+        if time.monotonic() - self.last_transition < quiet_period:
+            return False
+        return not any(esp.state is NodeState.MISSING for esp in self._by_name.values())
+
+    def get_or_add(self, name: str) -> ESP32:
+        esp = self._by_name.get(name)
+        if esp is None:
+            esp = self._by_name[name] = ESP32(name)
+        return esp
+
+    def set_ip(self, esp: ESP32, ip: str | None) -> None:
+        if esp.ip is not None and self._by_ip.get(esp.ip) is esp:
+            del self._by_ip[esp.ip]
+        esp.ip = ip
+        if ip is not None:
+            self._by_ip[ip] = esp
+
+    def _set_mac(self, esp: ESP32, mac: str) -> None:
+        if esp.mac is not None and self._by_mac.get(esp.mac) is esp:
+            del self._by_mac[esp.mac]
+        esp.mac = mac
+        self._by_mac[mac] = esp
+
+    def _rename(self, esp: ESP32, name: str) -> None:
+        if self._by_name.get(esp.name) is esp:
+            del self._by_name[esp.name]
+        esp.name = name
+        self._by_name[name] = esp
+
+    def handle_reply(self, reply: dict[str, Any]) -> ESP32:
+        """Register or update the node that sent the ArtPollReply."""
+        name: str = reply['ShortName']
+        mac: str = reply['Mac']
+        esp = self._by_mac.get(mac)
+        if esp is None:
+            esp = self._by_name.get(name)
+            if esp is None:
+                print(f"Unknown ESP '{name}' with mac {mac} has been registered")
+                esp = self.get_or_add(name)
+            else:
+                print(f"ESP '{name}' with mac {mac} connected for the first time")
+            self._set_mac(esp, mac)
+        else:
+            if esp.state in (NodeState.MISSING, NodeState.LOST):
+                print(f"ESP '{esp.name}' has regained the connection!")
+                self.last_transition = time.monotonic()
+            if esp.name != name:
+                self._rename(esp, name)
+        if esp.ip != reply['IpAddress']:
+            self.set_ip(esp, reply['IpAddress'])
+        esp.status = reply['NodeReport']
+        esp.state = NodeState.ONLINE
+        esp.subsequent_missed_replies = 0
+        esp.last_seen = time.monotonic()
+        self._replied.add(mac)
+        return esp
+
+    def end_poll_round(self) -> None:
+        """Count a missed reply for every connected node that has not replied since the last call."""
+        for esp in self._by_name.values():
+            if esp.state not in (NodeState.ONLINE, NodeState.MISSING) or esp.mac in self._replied:
+                continue
+            esp.subsequent_missed_replies += 1
+            print(f"ESP '{esp.name}' failed to reply! ({esp.subsequent_missed_replies} missed "
+                  f"repl{'ies' if esp.subsequent_missed_replies > 1 else 'y'})")
+            esp.state = NodeState.MISSING
+            self.last_transition = time.monotonic()
+            if esp.subsequent_missed_replies >= self.MISSED_REPLIES_UNTIL_LOST:
+                print(f"ESP '{esp.name}' lost the connection!")
+                esp.state = NodeState.LOST
+                esp.status = 'Lost connection!'
+        self._replied.clear()
@@ -0,0 +1,87 @@
+import threading
+from .commons import Subscriber, EventSourceType, EventActionType, EventValueType
+
+
+class _DispatchEntry:
+    """The merged subscriber lists for a single (source, action) pair."""
+    __slots__ = ("by_value", "any_value")
+
+    def __init__(self, by_value: dict[EventValueType, list[Subscriber]], any_value: list[Subscriber]) -> None:
+        self.by_value: dict[EventValueType, list[Subscriber]] = by_value
+        self.any_value: list[Subscriber] = any_value
+
+
+class SubscriberIndex:
+    """Maps events to the subscribers whose condition they satisfy.
+    Subscribers are stored in per-source -> per-action -> per-value buckets, with None acting as a wildcard.
+    The buckets that can match a given (source, action) pair are merged into a dispatch entry the first time an event
+    with that pair is resolved, so resolving an event takes two dict lookups. Entries are rebuilt lazily after the
+    subscribers change."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[EventSourceType | None,
+                            dict[EventActionType | None,
+                                 dict[EventValueType, list[Subscriber]]]] = {}
+        self._dispatch_cache: dict[tuple[EventSourceType, EventActionType], _DispatchEntry] = {}
+        self._lock = threading.Lock()
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, subscriber: Subscriber) -> None:
+        condition = subscriber.condition
+        with self._lock:
+            actions = self._buckets.setdefault(condition.source, {})
+            values = actions.setdefault(condition.action, {})
+            values.setdefault(condition.value, []).append(subscriber)
+            self._count += 1
+            self._dispatch_cache.clear()
+
+    def remove(self, subscriber: Subscriber) -> None:
+        condition = subscriber.condition
+        with self._lock:
+            try:
+                actions = self._buckets[condition.source]
+                values = actions[condition.action]
+                values[condition.value].remove(subscriber)
+            except (KeyError, ValueError):
+                return  # already removed
+            if not values[condition.value]:
+                del values[condition.value]
+            if not values:
+                del actions[condition.action]
+            if not actions:
+                del self._buckets[condition.source]
+            self._count -= 1
+            self._dispatch_cache.clear()
+
+    def resolve(self, source: EventSourceType, action: EventActionType, value: EventValueType) -> list[Subscriber]:
+        """Returns all subscribers matching the event. The returned list must not be modified."""
+        entry = self._dispatch_cache.get((source, action))
+        if entry is None:
+            entry = self._compile(source, action)
+        if value is None:
+            return entry.any_value
+        try:
+            return entry.by_value.get(value, entry.any_value)
+        except TypeError:  # unhashable value, so it can't match any value condition
+            return entry.any_value
+
+    def _compile(self, source: EventSourceType, action: EventActionType) -> _DispatchEntry:
+        with self._lock:
+            buckets: list[dict[EventValueType, list[Subscriber]]] = []
+            for s, a in ((source, action), (source, None), (None, action), (None, None)):
+                bucket = self._buckets.get(s, {}).get(a)
+                if bucket:
+                    buckets.append(bucket)
+
+            values = {value for bucket in buckets for value in bucket if value is not None}
+            any_value = [subscriber for bucket in buckets for subscriber in bucket.get(None, ())]
+            by_value = {
+                value: [subscriber for bucket in buckets for key in (value, None) for subscriber in bucket.get(key, ())]
+                for value in values
+            }
+            entry = _DispatchEntry(by_value, any_value)
+            self._dispatch_cache[(source, action)] = entry
+            return entry
@@ -0,0 +1,205 @@
+import bisect
+import math
+from collections import deque
+from typing import Any
+
+
+_SEQ_MODULUS: int = 255  # sequence numbers run from 1 to 255, 0 means the sender does not use sequence numbers
+_REORDER_WINDOW: int = 128  # packets that are at most this far behind the newest one are considered late, not new
+_JITTER_GAIN: float = 1 / 16  # smoothing of the jitter estimates, as in RFC 3550
+
+
+class StreamTelemetry:
+    """Packet statistics of a single sequence-numbered stream, e.g. the triggers of one sensor.
+    Retransmits of a packet that already arrived are counted as duplicates."""
+
+    __slots__ = ("received", "duplicates", "out_of_order", "lost", "jitter",
+                 "_last_seq", "_last_arrival", "_last_interval")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.received: int = 0
+        self.duplicates: int = 0
+        self.out_of_order: int = 0
+        self.lost: int = 0  # gaps in the sequence that have not been filled by late packets (yet)
+        self.jitter: float = 0.0  # smoothed variation of the inter-arrival time of new packets in seconds
+        self._last_seq: int = 0
+        self._last_arrival: float | None = None
+        self._last_interval: float | None = None
+
+    def record(self, seq: int, ts: float) -> None:
+        self.received += 1
+        if seq == 0 or self._last_seq == 0:
+            self._last_seq = seq
+            self._record_arrival(ts)
+            return
+        distance = (seq - self._last_seq) % _SEQ_MODULUS
+        if distance == 0:
+            self.duplicates += 1
+        elif distance < _REORDER_WINDOW:
+            self.lost += distance - 1
+            self._last_seq = seq
+            self._record_arrival(ts)
+        else:
+            # Arrived after a newer packet. Its gap was counted as lost, but it can't be told apart from a duplicate
+            # of a packet that arrived late already, so the loss count is only corrected while it is positive.
+            self.out_of_order += 1
+            self.lost = max(0, self.lost - 1)
+
+    def _record_arrival(self, ts: float) -> None:
+        if self._last_arrival is not None:
+            interval = ts - self._last_arrival
+            if self._last_interval is not None:
+                self.jitter += _JITTER_GAIN * (abs(interval - self._last_interval) - self.jitter)
+            self._last_interval = interval
+        self._last_arrival = ts
+
+    @property
+    def loss_rate(self) -> float:
+        expected = self.received - self.duplicates + self.lost
+        return self.lost / expected if expected else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "out_of_order": self.out_of_order,
+            "lost": self.lost,
+            "loss_rate": self.loss_rate,
+            "jitter_ms": 1000 * self.jitter,
+        }
+
+
+class RttHistogram:
+    """Round trip times of the pings to a node, bucketed by upper bound in milliseconds."""
+
+    BUCKETS_MS: tuple[float, ...] = (5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self) -> None:
+        self.counts: list[int] = [0] * (len(self.BUCKETS_MS) + 1)  # the last bucket collects everything slower
+        self.timeouts: int = 0
+        self.jitter: float = 0.0  # smoothed variation between consecutive round trip times in seconds
+        self.min: float | None = None
+        self.max: float | None = None
+        self._last_rtt: float | None = None
+
+    def record(self, rtt: float | None) -> None:
+        """Add a round trip time in seconds, or None for a ping that timed out."""
+        if rtt is None:
+            self.timeouts += 1
+            return
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, 1000 * rtt)] += 1
+        self.min = rtt if self.min is None else min(self.min, rtt)
+        self.max = rtt if self.max is None else max(self.max, rtt)
+        if self._last_rtt is not None:
+            self.jitter += _JITTER_GAIN * (abs(rtt - self._last_rtt) - self.jitter)
+        self._last_rtt = rtt
+
+    @property
+    def replies(self) -> int:
+        return sum(self.counts)
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        return {
+            "replies": self.replies,
+            "timeouts": self.timeouts,
+            "min_ms": None if self.min is None else 1000 * self.min,
+            "max_ms": None if self.max is None else 1000 * self.max,
+            "jitter_ms": 1000 * self.jitter,
+            "histogram": dict(zip(labels, self.counts)),
+        }
+
+
+class RttWindow:
+    """The most recent round trip times of a node, for percentile estimates that follow changes of the link quickly."""
+
+    def __init__(self, size: int = 50) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, rtt: float) -> None:
+        self._samples.append(rtt)
+
+    def percentile(self, percent: float) -> float | None:
+        """The nearest-rank percentile of the window in seconds, or None if it is empty."""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        rank = max(0, min(len(samples) - 1, math.ceil(percent / 100 * len(samples)) - 1))
+        return samples[rank]
+
+
+class NodeTelemetry:
+    """Packet statistics of all sensors of a node and the round trip times of pings to it."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, StreamTelemetry] = {}
+        self.rtt: RttHistogram = RttHistogram()
+        self.rtt_window: RttWindow = RttWindow()
+
+    def record_rtt(self, rtt: float | None, timeout: float) -> None:
+        """Add the round trip time of a ping in seconds, or None if no reply arrived within the timeout.
+        Timeouts enter the sliding window with the timeout as their round trip time."""
+        self.rtt.record(rtt)
+        self.rtt_window.record(rtt if rtt is not None else timeout)
+
+    def add_stream(self, name: str) -> StreamTelemetry:
+        return self.streams.setdefault(name, StreamTelemetry())
+
+    def _total(self, attribute: str) -> int:
+        return sum(getattr(stream, attribute) for stream in self.streams.values())
+
+    @property
+    def received(self) -> int:
+        return self._total("received")
+
+    @property
+    def duplicates(self) -> int:
+        return self._total("duplicates")
+
+    @property
+    def out_of_order(self) -> int:
+        return self._total("out_of_order")
+
+    @property
+    def lost(self) -> int:
+        return self._total("lost")
+
+    @property
+    def loss_rate(self) -> float:
+        expected = self.received - self.duplicates + self.lost
+        return self.lost / expected if expected else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """The worst inter-arrival jitter of any of the node's streams"""
+        return max((stream.jitter for stream in self.streams.values()), default=0.0)
+
+    def _percentile_ms(self, percent: float) -> float | None:
+        rtt = self.rtt_window.percentile(percent)
+        return None if rtt is None else 1000 * rtt
+
+    def reset(self) -> None:
+        for stream in self.streams.values():
+            stream.reset()  # the event manager holds on to the streams
+        self.rtt = RttHistogram()
+        self.rtt_window = RttWindow()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "out_of_order": self.out_of_order,
+            "lost": self.lost,
+            "loss_rate": self.loss_rate,
+            "jitter_ms": 1000 * self.jitter,
+            "rtt": self.rtt.snapshot(),
+            "rtt_p50_ms": self._percentile_ms(50),
+            "rtt_p95_ms": self._percentile_ms(95),
+            "sensors": {name: stream.snapshot() for name, stream in self.streams.items()},
+        }
@@ -0,0 +1,129 @@
+import asyncio
+import inspect
+import math
+import time
+from typing import Any, Callable
+from .callback_executor import CallbackExecutor
+from .frame_scheduler import FrameScheduler
+
+
+class PeriodicTask:
+    """A function that is called at a fixed rate by the TickScheduler."""
+
+    def __init__(self, scheduler: "TickScheduler", func: Callable[..., Any], interval: float,
+                 args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        self._scheduler: TickScheduler = scheduler
+        self.func: Callable[..., Any] = func
+        self.interval: float = interval
+        self.args: tuple[Any, ...] = args
+        self.kwargs: dict[str, Any] = kwargs
+        self.next_deadline: float = 0.0  # time.monotonic() timestamp of the next run
+        self.stopped: bool = False
+        self._timer: asyncio.TimerHandle | None = None
+        self._future: asyncio.Future | None = None
+
+        self.runs: int = 0
+        self.overruns: int = 0  # ticks skipped because the previous run had not finished yet
+        self.missed: int = 0  # ticks skipped because the scheduler itself was late
+        self.max_duration: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return f"{CallbackExecutor.script_name(self.func)}.{self.func.__name__}"
+
+    @property
+    def frequency(self) -> float:
+        return 1 / self.interval
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def stop(self) -> None:
+        """Stop calling the function. Thread-safe. A run that is in progress is not interrupted."""
+        self._scheduler.cancel(self)
+
+
+class TickScheduler:
+    """Runs periodic functions at a fixed rate from the event loop.
+    Deadlines advance by exactly one interval per tick, independent of how long the function took, so the rate does not
+    drift. If the previous run has not finished by the next deadline, that tick is skipped and counted as an overrun.
+    Synchronous functions run in the CallbackExecutor, coroutine functions as tasks on the loop."""
+
+    def __init__(self,
+                 loop: asyncio.AbstractEventLoop,
+                 executor: CallbackExecutor,
+                 frame_scheduler: FrameScheduler) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._executor: CallbackExecutor = executor
+        self._frame_scheduler: FrameScheduler = frame_scheduler
+        self.tasks: list[PeriodicTask] = []
+
+    def schedule(self,
+                 func: Callable[..., Any],
+                 frequency: float,
+                 *args: Any,
+                 align_to_frame: bool = False,
+                 **kwargs: Any) -> PeriodicTask:
+        """Call func(*args, **kwargs) frequency times per second until the returned task is stopped. Thread-safe.
+        If align_to_frame is set, the first run (and every run, if the interval is a multiple of the frame interval)
+        coincides with a frame of the FrameScheduler."""
+        if frequency <= 0:
+            raise ValueError("Frequency must be positive")
+        task = PeriodicTask(self, func, 1 / frequency, args, kwargs)
+        self.tasks.append(task)
+        self._loop.call_soon_threadsafe(self._start, task, align_to_frame)
+        return task
+
+    def cancel(self, task: PeriodicTask) -> None:
+        task.stopped = True
+        if task in self.tasks:
+            self.tasks.remove(task)
+        self._loop.call_soon_threadsafe(self._cancel_timer, task)
+
+    @staticmethod
+    def _cancel_timer(task: PeriodicTask) -> None:
+        if task._timer is not None:
+            task._timer.cancel()
+
+    def _start(self, task: PeriodicTask, align_to_frame: bool) -> None:
+        now = time.monotonic()
+        task.next_deadline = self._frame_scheduler.next_frame_time(now) if align_to_frame else now
+        self._arm(task)
+
+    def _arm(self, task: PeriodicTask) -> None:
+        if task.stopped:
+            return
+        delay = task.next_deadline - time.monotonic()
+        task._timer = self._loop.call_later(max(0.0, delay), self._tick, task)
+
+    def _tick(self, task: PeriodicTask) -> None:
+        if task.stopped:
+            return
+        if task.running:
+            task.overruns += 1
+        else:
+            task.runs += 1
+            self._run(task)
+
+        task.next_deadline += task.interval
+        now = time.monotonic()
+        if task.next_deadline <= now:
+            # Stay on the original grid, dropping ticks that are already in the past
+            missed = math.floor((now - task.next_deadline) / task.interval) + 1
+            task.missed += missed
+            task.next_deadline += missed * task.interval
+        self._arm(task)
+
+    def _run(self, task: PeriodicTask) -> None:
+        if inspect.iscoroutinefunction(task.func):
+            task._future = self._loop.create_task(task.func(*task.args, **task.kwargs))
+            return
+        task._future = self._executor.submit(task.func, *task.args, **task.kwargs)
+        task._future.add_done_callback(lambda f: self._record_duration(task, f))
+
+    @staticmethod
+    def _record_duration(task: PeriodicTask, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        task.max_duration = max(task.max_duration, future.result())
@@ -1,3 +1,4 @@
 from .device import Device
 from .fixture import BaseFixture
 from .sensor import BaseSensor
+from .link_quality import LinkQuality
@@ -19,9 +19,14 @@ class Device:
 
     def should_ignore_seq(self, seq: int) -> bool:
         """Returns whether the given sequence integer should be considered as outdated. Seq 0 is never ignored."""
-        if seq == 0 or self._seq == 0:
+        return self.is_outdated_seq(self._seq, seq)
+
+    @staticmethod
+    def is_outdated_seq(last_seq: int, seq: int) -> bool:
+        """Returns whether seq is not newer than last_seq, taking wrap-around into account. Seq 0 is never outdated."""
+        if seq == 0 or last_seq == 0:
             return False  # never ignore seq=0
-        return seq <= self._seq and not (seq < 16 and self._seq > 255-16)
+        return seq <= last_seq and not (seq < 16 and last_seq > 255-16)
 
     @property
     def name(self) -> str:
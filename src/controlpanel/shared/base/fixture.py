@@ -11,6 +11,11 @@ class BaseFixture(Device):
     def universe(self) -> int:
         return self._universe
 
+    @property
+    def universes(self) -> tuple[int, ...]:
+        """All universes this fixture listens on. Fixtures that need more than 512 channels span consecutive universes."""
+        return (self._universe,)
+
     @staticmethod
     def _universe_from_string(string: str) -> int:
         import hashlib
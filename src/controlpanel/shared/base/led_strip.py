@@ -7,6 +7,14 @@ except TypeError:
 
 _MIN_UPDATE_RATE: float = const(0.1)
 _MAX_UPDATE_RATE: float = const(30.0)
+_DMX_UNIVERSE_SIZE: int = const(512)
+
+# First byte of an LEDStrip DMX frame. Values in between select an animation (index + 1).
+FRAME_TYPE_PIXELS: int = const(0)
+FRAME_TYPE_DELTA: int = const(0xFF)
+
+# use_compression mode that sends a hue and a lightness byte per pixel, see upy/c_modules/hsl_decompression.c
+COMPRESSION_HSL: str = "hsl"
 
 
 def interpolate_color(color1: tuple[int, int, int], color2: tuple[int, int, int], factor: float) -> tuple[int, int, int]:
@@ -15,30 +23,63 @@ def interpolate_color(color1: tuple[int, int, int], color2: tuple[int, int, int]
             int(color1[2] + (color2[2] - color1[2]) * factor))
 
 
+# The animations are integer-only, so that they produce exactly the same frames as the native implementations in
+# upy/c_modules/led_animations.c, which the node uses if available. Positions are in 1/256 LEDs.
+_ANIMATION_FRAME_MASK: int = const(0xFFFF)
+_FIRE_COOLING: int = const(55)
+_FIRE_SPARKING: int = const(120)
+
+
+def animation_step(update_rate_ms: int, speed: float | None) -> int:
+    """How far an animation moves per frame in 1/256 LEDs, for a speed in LEDs per second."""
+    return int((speed or 0.0) * update_rate_ms * 256 / 1000)
+
+
+def advance_position(position: int, step: int, led_count: int) -> int:
+    """Positions wrap at a multiple of both the strip length and 4 LEDs (the twinkle period), so no effect jumps."""
+    return (position + step) % (max(1, led_count) << 10)
+
+
+def _blend_into(buf: bytearray, offset: int,
+                color1: tuple[int, int, int], color2: tuple[int, int, int], weight: int) -> None:
+    """Write color1 blended towards color2 by weight / 256 into buf at offset."""
+    inverse = 256 - weight
+    buf[offset] = (color1[0] * inverse + color2[0] * weight) >> 8
+    buf[offset + 1] = (color1[1] * inverse + color2[1] * weight) >> 8
+    buf[offset + 2] = (color1[2] * inverse + color2[2] * weight) >> 8
+
+
+def _hash(x: int) -> int:
+    """16-bit hash. The products stay below 2 ** 30, so MicroPython never has to allocate a big integer."""
+    x &= 0xFFFF
+    x = ((x ^ (x >> 8)) * 0x2D35) & 0xFFFF
+    x = ((x ^ (x >> 7)) * 0x3A8D) & 0xFFFF
+    return x ^ (x >> 8)
+
+
+def _random8(frame: int, index: int, salt: int) -> int:
+    return _hash(_hash(frame) ^ (index << 2) ^ salt) & 0xFF
+
+
 def looping_line(_update_rate_ms: int,
                  _buf: bytearray,
                  speed: float,
                  color1: tuple[int, int, int],
                  color2: tuple[int, int, int],
                  ) -> Generator[None, None, None]:
-    offset_per_update = speed * (_update_rate_ms / 1000)
+    step = animation_step(_update_rate_ms, speed)
     led_count = len(_buf) // 3
-    # buf = bytearray(led_count * 3)
-    position: float = 0.0
+    total = max(1, led_count) << 8
+    position: int = 0
 
     while True:
+        offset = position % total
         for i in range(led_count):
-            dist = abs((i - position) % led_count)
-            fade = max(0.0, 1.0 - dist / 3.0)
-            color = interpolate_color(color2, color1, fade)
-
-            offset = i * 3
-            _buf[offset + 0] = color[0]
-            _buf[offset + 1] = color[1]
-            _buf[offset + 2] = color[2]
+            dist = ((i << 8) - offset) % total
+            _blend_into(_buf, 3 * i, color2, color1, max(0, 256 - dist // 3))  # a line fading out over 3 LEDs
 
         yield None
-        position = (position + offset_per_update) % led_count
+        position = advance_position(position, step, led_count)
 
 
 def strobe(_update_rate_ms: int,
@@ -58,10 +99,121 @@ def strobe(_update_rate_ms: int,
             yield None
 
 
+def gradient(_update_rate_ms: int,
+             _buf: bytearray,
+             speed: float,
+             color1: tuple[int, int, int],
+             color2: tuple[int, int, int],
+             ) -> Generator[None, None, None]:
+    """Fades from color1 to color2 in the middle of the strip and back, scrolling by speed LEDs per second."""
+    step = animation_step(_update_rate_ms, speed)
+    led_count = len(_buf) // 3
+    total = max(1, led_count) << 8
+    position: int = 0
+
+    while True:
+        offset = position % total
+        for i in range(led_count):
+            fraction = 2 * (((i << 8) + offset) % total) // led_count  # 0..511
+            _blend_into(_buf, 3 * i, color1, color2, fraction if fraction <= 256 else 512 - fraction)
+
+        yield None
+        position = advance_position(position, step, led_count)
+
+
+def chase(_update_rate_ms: int,
+          _buf: bytearray,
+          speed: float,
+          color1: tuple[int, int, int],
+          color2: tuple[int, int, int],
+          ) -> Generator[None, None, None]:
+    """Every third LED in color1 on a color2 background, moving by speed LEDs per second."""
+    step = animation_step(_update_rate_ms, speed)
+    led_count = len(_buf) // 3
+    total = max(1, led_count) << 8
+    position: int = 0
+
+    while True:
+        lit = ((position % total) >> 8) % 3
+        for i in range(led_count):
+            color = color1 if i % 3 == lit else color2
+            _buf[3 * i] = color[0]
+            _buf[3 * i + 1] = color[1]
+            _buf[3 * i + 2] = color[2]
+
+        yield None
+        position = advance_position(position, step, led_count)
+
+
+def twinkle(_update_rate_ms: int,
+            _buf: bytearray,
+            speed: float,
+            color1: tuple[int, int, int],
+            color2: tuple[int, int, int],
+            ) -> Generator[None, None, None]:
+    """Every LED fades from color2 to color1 and back with its own phase, speed / 4 times per second."""
+    step = animation_step(_update_rate_ms, speed)
+    led_count = len(_buf) // 3
+    position: int = 0
+
+    while True:
+        for i in range(led_count):
+            phase = (position + _hash(i)) & 0x3FF
+            level = phase >> 1 if phase < 512 else (1023 - phase) >> 1
+            _blend_into(_buf, 3 * i, color2, color1, (level * level) >> 8)  # short flashes instead of a sine
+
+        yield None
+        position = advance_position(position, step, led_count)
+
+
+def _fire_step(heat: bytearray, frame: int) -> None:
+    """One step of the Fire2012 simulation: cool down every cell, let the heat rise and maybe ignite a new spark."""
+    led_count = len(heat)
+    if not led_count:
+        return
+    cooling = (_FIRE_COOLING * 10) // led_count + 2
+    for i in range(led_count):
+        cool = _random8(frame, i, 0) % cooling
+        heat[i] = heat[i] - cool if heat[i] > cool else 0
+    for k in range(led_count - 1, 1, -1):
+        heat[k] = (heat[k - 1] + 2 * heat[k - 2]) // 3
+    if _random8(frame, 0, 1) < _FIRE_SPARKING:
+        y = _random8(frame, 0, 2) % min(led_count, 7)
+        heat[y] = min(255, heat[y] + 160 + _random8(frame, 0, 3) % 96)
+
+
+def fire(_update_rate_ms: int,
+         _buf: bytearray,
+         speed: None = None,
+         color1: tuple[int, int, int] = (255, 0, 0),
+         color2: tuple[int, int, int] = (255, 160, 0),
+         ) -> Generator[None, None, None]:
+    """Flames rising from the start of the strip, glowing from black over color1 to color2 at their hottest."""
+    led_count = len(_buf) // 3
+    heat = bytearray(led_count)
+    frame: int = 0
+
+    while True:
+        _fire_step(heat, frame)
+        for i in range(led_count):
+            temperature = heat[i]
+            if temperature < 128:
+                _blend_into(_buf, 3 * i, (0, 0, 0), color1, temperature << 1)
+            else:
+                _blend_into(_buf, 3 * i, color1, color2, (temperature - 128) << 1)
+
+        yield None
+        frame = (frame + 1) & _ANIMATION_FRAME_MASK
+
+
 class BaseLEDStrip:
-    ANIMATIONS: list[Animation] = [
+    ANIMATIONS: list[Animation] = [  # the index + 1 is sent as the frame type, don't reorder
         looping_line,
         strobe,
+        gradient,
+        chase,
+        twinkle,
+        fire,
     ]
 
     def __init__(self, rgb_order: Literal["RGB", "RBG", "GRB", "GBR", "BRG", "BGR"] = "RGB"):
@@ -70,6 +222,18 @@ class BaseLEDStrip:
                                                    index_map[rgb_order[1]],
                                                    index_map[rgb_order[2]])
 
+    @staticmethod
+    def bytes_per_pixel(use_compression: bool | str) -> int:
+        """3 for uncompressed RGB, 1 for RRRGGGBB (use_compression=True) and 2 for hue and lightness ("hsl")."""
+        if use_compression == COMPRESSION_HSL:
+            return 2
+        return 1 if use_compression else 3
+
+    @staticmethod
+    def pixels_per_universe(use_compression: bool | str) -> int:
+        """The number of pixels that fit into a single universe, next to the frame type byte."""
+        return (_DMX_UNIVERSE_SIZE - 1) // BaseLEDStrip.bytes_per_pixel(use_compression)
+
     @staticmethod
     def encode_update_rate(rate: float):
         from math import log
@@ -0,0 +1,34 @@
+from math import log, ceil
+from controlpanel.shared.compatibility import const
+
+
+_TARGET_FAILURE_RATE: float = const(0.01)  # the probability of all copies of a packet getting lost we aim for
+
+
+class LinkQuality:
+    """Estimates the packet loss of a link from acknowledged and unacknowledged transmissions and derives how many
+    retransmits a packet needs to arrive with high probability."""
+
+    def __init__(self, max_retransmits: int = 4, smoothing: float = 0.05) -> None:
+        self.max_retransmits: int = max_retransmits
+        self._smoothing: float = smoothing
+        self.loss: float = 0.0  # exponentially weighted moving average of the fraction of unacknowledged transmissions
+        self.sent: int = 0
+        self.acknowledged: int = 0
+        self.retransmitted: int = 0
+
+    def record(self, acknowledged: bool) -> None:
+        self.sent += 1
+        if acknowledged:
+            self.acknowledged += 1
+        self.loss += self._smoothing * ((0.0 if acknowledged else 1.0) - self.loss)
+
+    def retransmits(self) -> int:
+        """The number of retransmits needed so that the chance of every copy getting lost is below the target.
+        Always at least one, since a single lost ACK must not leave a state change undelivered."""
+        if self.loss <= _TARGET_FAILURE_RATE:
+            return 1
+        if self.loss >= 1.0:
+            return self.max_retransmits
+        copies = ceil(log(_TARGET_FAILURE_RATE) / log(self.loss))
+        return max(1, min(self.max_retransmits, copies - 1))
@@ -4,8 +4,13 @@ import _thread
 
 from .helper import (
     ARTNET_REPLY_PARSER,
+    ARTNET_PACKET_VIEWS,
+    ARTDMX_PAYLOAD_OFFSET,
     OpCode,
-    parse_header,
+    artdmx_sequence,
+    artdmx_universe,
+    decode_artdmx,
+    parse_header_into,
     pack_address,
     pack_dmx,
     pack_ip,
@@ -26,8 +31,10 @@ SHOW = 3
 UNDEFINED = 4  # 4-255
 
 DEFAULT_FPS = 40.0
+PACKET_BUFFER_SIZE = 1024
 
 ArtNetCallback = object
+ArtDmxCallback = object
 
 
 class ArtNet:
@@ -41,6 +48,15 @@ class ArtNet:
         self.server_thread = _thread.start_new_thread(self.__init_socket, ())
 
         self.register: dict[OpCode, ArtNetCallback] = {}
+        self._artdmx_callback: ArtDmxCallback | None = None
+
+        # Incoming packets are received into this buffer, so ArtDmx packets can be handled without allocating.
+        self._packet_buffer = bytearray(PACKET_BUFFER_SIZE)
+        self._packet_view = memoryview(self._packet_buffer)
+        # Address of the controller, learned from its first ArtPoll. Until then packets are received with recvfrom.
+        self._controller: tuple[str, int] | None = None
+        # One lazily decoded view per op code, rebound to the receive buffer for every packet
+        self._views = {op_code: view() for op_code, view in ARTNET_PACKET_VIEWS.items()}
 
     @property
     def ip(self) -> str:
@@ -77,26 +93,64 @@ class ArtNet:
         for op_code in ARTNET_REPLY_PARSER.keys():
             self.register[op_code] = callback
 
+    def subscribe_artdmx(self, callback: ArtDmxCallback) -> None:
+        """Subscribe to ArtDmx packets via the zero-copy fast path.
+        The callback is called as callback(universe, sequence, data), where data is a memoryview into the receive
+        buffer. It is only valid until the callback returns and must be copied if it is needed for longer."""
+        self._artdmx_callback = callback
+
     def unsubscibe(self, op_code: OpCode) -> None:
         if op_code in self.register:
             del self.register[op_code]
 
-    def receive(self, buffer_size: int = 1024) -> None:
-        # Buffer size of 1024 bytes
-        data, addr = self.socket_server.recvfrom(buffer_size)
-        op_code = parse_header(data)
-        if op_code is not None:
-            parser = ARTNET_REPLY_PARSER.get(op_code, lambda x: x)
-            subscriber = self.register.get(op_code)
-
-            if subscriber is None:
+    def receive(self, buffer_size: int = PACKET_BUFFER_SIZE) -> None:
+        if self._controller is None:
+            # Only recvfrom tells who sent a packet, but it allocates a new bytes object for each one
+            data, addr = self.socket_server.recvfrom(buffer_size)
+            size = len(data)
+            self._packet_buffer[:size] = data
+            if parse_header_into(self._packet_buffer, size) == OpCode.ArtPoll:
+                self._controller = addr
+            self._dispatch(size, addr)
+            return
+        # The ESP32 port has no recvfrom_into, but readinto receives a datagram straight into the buffer.
+        # The sender is unknown then, so all packets are taken to be from the controller.
+        size = self.socket_server.readinto(self._packet_buffer)
+        self._dispatch(size, self._controller)
+
+    def _dispatch(self, size: int, addr: tuple[str, int]) -> None:
+        buf = self._packet_buffer
+        op_code = parse_header_into(buf, size)
+        if op_code is None:
+            return
+
+        if op_code == OpCode.ArtDmx and self._artdmx_callback is not None:
+            length = decode_artdmx(buf, size)
+            if length < 0:
                 return
-
-            reply = parser(data)
-            if reply is None:
-                return
-
-            subscriber(op_code, *addr, reply)
+            self._artdmx_callback(artdmx_universe(buf),
+                                  artdmx_sequence(buf),
+                                  self._packet_view[ARTDMX_PAYLOAD_OFFSET:ARTDMX_PAYLOAD_OFFSET + length])
+            return
+
+        subscriber = self.register.get(op_code)
+        if subscriber is None:
+            return
+
+        # Subscribers receive a view that decodes fields on access. It is only valid until the subscriber returns.
+        # Small packets whose fields are all read anyway are cheaper to parse into a dict.
+        view = self._views.get(op_code)
+        if view is not None:
+            if view.bind(self._packet_view, size):
+                subscriber(op_code, addr[0], addr[1], view)
+            return
+
+        parser = ARTNET_REPLY_PARSER.get(op_code, lambda x: x)
+        reply = parser(bytes(self._packet_view[:size]))
+        if reply is None:
+            return
+
+        subscriber(op_code, addr[0], addr[1], reply)
 
     def send_poll(self) -> None:
         """Send an ArtPoll packet."""
@@ -119,6 +173,10 @@ class ArtNet:
         """Sends a Trigger packet."""
         self.sock.sendto(pack_trigger(key, subkey, data), self.address)
 
+    def send_packet(self, packet: bytes | bytearray | memoryview) -> None:
+        """Send a packet that was assembled by the caller, e.g. into a preallocated buffer."""
+        self.sock.sendto(packet, self.address)
+
     def send_sync(self) -> None:
         """Sends a Sync packet."""
         self.sock.sendto(pack_sync(), self.address)
@@ -16,6 +16,8 @@ ART_NET_HEADER = b"Art-Net\x00"
 ART_NET_VERSION = struct.pack(">H", 14)  # Protocol version
 ART_NET_OEM = struct.pack("<H", 0x00FF)  # OEM code OemUnknown 0x00ff
 ART_NET_ESTA_MAN = struct.pack("<H", 0)  # ESTA Manufacturer code
+ARTDMX_PAYLOAD_OFFSET = 18
+ARTTRIGGER_SUBKEY_OFFSET = 17
 
 
 class OpCode(IntEnum):
@@ -43,6 +45,43 @@ def parse_header(data: bytearray) -> OpCode | None:
         return None
 
 
+def is_artnet_buffer(buf: bytearray, size: int) -> bool:
+    """Allocation-free variant of is_artnet for preallocated receive buffers."""
+    if size < 10:
+        return False
+    for i in range(8):
+        if buf[i] != ART_NET_HEADER[i]:
+            return False
+    return True
+
+
+def parse_header_into(buf: bytearray, size: int) -> int | None:
+    """Allocation-free variant of parse_header for preallocated receive buffers."""
+    if not is_artnet_buffer(buf, size):
+        return None
+    return buf[8] | (buf[9] << 8)
+
+
+def decode_artdmx(buf: bytearray, size: int) -> int:
+    """Validates the ArtDmx packet in buf without allocating.
+    Returns the length of the DMX payload (starting at ARTDMX_PAYLOAD_OFFSET), or -1 if the packet is malformed.
+    Sequence and universe can then be read with artdmx_sequence and artdmx_universe."""
+    if size < ARTDMX_PAYLOAD_OFFSET:
+        return -1
+    length = (buf[16] << 8) | buf[17]
+    if ARTDMX_PAYLOAD_OFFSET + length > size:
+        return -1
+    return length
+
+
+def artdmx_sequence(buf: bytearray) -> int:
+    return buf[12]
+
+
+def artdmx_universe(buf: bytearray) -> int:
+    return buf[14] | (buf[15] << 8)
+
+
 def parse_poll(data: bytes) -> dict[str, Any] | None:
     if len(data) < 22:
         return None
@@ -234,7 +273,7 @@ def parse_command(data: bytes) -> dict[str, Any] | None:
     reply = dict(
         ProtVer=struct.unpack("<H", data[10:12])[0],
         EstaMan=struct.unpack("<H", data[12:14])[0],
-        Length=struct.unpack("<H", data[14:16])[0],
+        Length=struct.unpack(">H", data[14:16])[0],
         Command=data[16:].decode().strip("\0"),
     )
 
@@ -262,6 +301,209 @@ ARTNET_REPLY_PARSER = {
 }
 
 
+def _u16le(buf, offset: int) -> int:
+    return buf[offset] | (buf[offset + 1] << 8)
+
+
+def _u16be(buf, offset: int) -> int:
+    return (buf[offset] << 8) | buf[offset + 1]
+
+
+def _ip(buf, offset: int) -> str:
+    return "%d.%d.%d.%d" % (buf[offset], buf[offset + 1], buf[offset + 2], buf[offset + 3])
+
+
+def _string(buf, start: int, end: int) -> str:
+    """Decode the null-terminated string in buf[start:end]"""
+    for i in range(start, end):
+        if buf[i] == 0:
+            end = i
+            break
+    return bytes(buf[start:end]).decode()
+
+
+class PacketView:
+    """Read-only view of a received Art-Net packet that decodes fields only when they are accessed.
+    Fields are available as attributes and, for compatibility with the parse_* functions, via get() and [].
+    A view is bound to the receive buffer and reused for every packet of its op code, so it is only valid until the
+    callback it was passed to returns. Use to_dict() to keep the contents for longer."""
+
+    __slots__ = ("_buf", "_size")
+    MIN_LENGTH: int = 10
+    FIELDS: tuple[str, ...] = ()
+
+    def __init__(self, buf: bytes | bytearray | memoryview = b"", size: int = 0) -> None:
+        self._buf = buf
+        self._size: int = size
+
+    def bind(self, buf: bytes | bytearray | memoryview, size: int) -> bool:
+        """Point the view at a new packet. Returns False if the packet is too short for this op code."""
+        self._buf = buf
+        self._size = size
+        return size >= self.MIN_LENGTH
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self) -> tuple[str, ...]:
+        return self.FIELDS
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def _bytes(self, start: int, end: int | None = None) -> bytes:
+        return bytes(self._buf[start:self._size if end is None else min(end, self._size)])
+
+    ProtVer = property(lambda self: _u16le(self._buf, 10))
+
+
+class ArtPollView(PacketView):
+    __slots__ = ()
+    MIN_LENGTH = 22
+    FIELDS = ("ProtVer", "Flags", "DiagPriority", "TargetPort", "EstaMan", "Oem")
+
+    Flags = property(lambda self: [bool(self._buf[12] >> i & 1) for i in range(8)])
+    DiagPriority = property(lambda self: self._buf[13])
+    TargetPort = property(lambda self: [_u16le(self._buf, 16), _u16le(self._buf, 14)])
+    EstaMan = property(lambda self: _u16le(self._buf, 18))
+    Oem = property(lambda self: _u16le(self._buf, 20))
+
+
+class ArtPollReplyView(PacketView):
+    __slots__ = ()
+    MIN_LENGTH = 239
+    FIELDS = ("IpAddress", "PortNumber", "VersInfo", "NetSwitch", "SubSwitch", "Oem", "UbeaVersion", "Status1",
+              "EstaMan", "ShortName", "LongName", "NodeReport", "NumPorts", "PortTypes", "GoodInput", "GoodOutput",
+              "SwIn", "SwOut", "SwVideo", "SwMacro", "SwRemote", "Spare1", "Spare2", "Spare3", "Style", "Mac",
+              "BindIp", "BindIndex", "Status2", "Filler")
+
+    ProtVer = property(lambda self: None)  # ArtPollReply has no protocol version field
+    IpAddress = property(lambda self: _ip(self._buf, 10))
+    PortNumber = property(lambda self: _u16le(self._buf, 14))
+    VersInfo = property(lambda self: _u16le(self._buf, 16))
+    NetSwitch = property(lambda self: self._buf[18])
+    SubSwitch = property(lambda self: self._buf[19])
+    Oem = property(lambda self: _u16le(self._buf, 20))
+    UbeaVersion = property(lambda self: self._buf[22])
+    Status1 = property(lambda self: self._buf[23])
+    EstaMan = property(lambda self: _u16le(self._buf, 24))
+    ShortName = property(lambda self: _string(self._buf, 26, 44))
+    LongName = property(lambda self: _string(self._buf, 44, 108))
+    NodeReport = property(lambda self: _string(self._buf, 108, 172))
+    NumPorts = property(lambda self: _u16le(self._buf, 172))
+    PortTypes = property(lambda self: list(self._buf[174:178]))
+    GoodInput = property(lambda self: list(self._buf[178:182]))
+    GoodOutput = property(lambda self: list(self._buf[182:186]))
+    SwIn = property(lambda self: list(self._buf[186:190]))
+    SwOut = property(lambda self: list(self._buf[190:194]))
+    SwVideo = property(lambda self: self._buf[194])
+    SwMacro = property(lambda self: self._buf[195])
+    SwRemote = property(lambda self: self._buf[196])
+    Spare1 = property(lambda self: self._buf[197])
+    Spare2 = property(lambda self: self._buf[198])
+    Spare3 = property(lambda self: self._buf[199])
+    Style = property(lambda self: self._buf[200])
+    Mac = property(lambda self: ":".join("%02x" % self._buf[i] for i in range(201, 207)))
+    BindIp = property(lambda self: _ip(self._buf, 207))
+    BindIndex = property(lambda self: self._buf[211])
+    Status2 = property(lambda self: self._buf[212])
+    Filler = property(lambda self: self._bytes(213, 239).strip(b"\0"))
+
+
+class ArtDmxView(PacketView):
+    __slots__ = ()
+    MIN_LENGTH = 18
+    FIELDS = ("ProtVer", "Sequence", "Physical", "Universe", "Length", "Data")
+
+    Sequence = property(lambda self: self._buf[12])
+    Physical = property(lambda self: self._buf[13])
+    Universe = property(lambda self: _u16le(self._buf, 14))
+    Length = property(lambda self: _u16be(self._buf, 16))
+    Data = property(lambda self: self._bytes(18))
+
+
+class ArtNzsView(ArtDmxView):
+    __slots__ = ()
+    FIELDS = ("ProtVer", "Sequence", "StartCode", "Universe", "Length", "Data")
+
+    StartCode = property(lambda self: self._buf[13])
+
+
+class ArtSyncView(PacketView):
+    __slots__ = ()
+    MIN_LENGTH = 14
+    FIELDS = ("ProtVer", "Aux1", "Aux2")
+
+    Aux1 = property(lambda self: self._buf[12])
+    Aux2 = property(lambda self: self._buf[13])
+
+
+class ArtIpProgView(PacketView):
+    __slots__ = ()
+    MIN_LENGTH = 32
+    FIELDS = ("ProtVer", "Command", "ProgIp", "ProgSm", "ProgPort", "ProgDg")
+
+    Command = property(lambda self: self._buf[14])
+    ProgIp = property(lambda self: _ip(self._buf, 16))
+    ProgSm = property(lambda self: _ip(self._buf, 20))
+    ProgPort = property(lambda self: _u16le(self._buf, 24))
+    ProgDg = property(lambda self: _ip(self._buf, 26))
+
+
+class ArtIpProgReplyView(PacketView):
+    __slots__ = ()
+    MIN_LENGTH = 34
+    FIELDS = ("ProtVer", "ProgIp", "ProgSm", "ProgPort", "Status", "ProgDg")
+
+    ProgIp = property(lambda self: _ip(self._buf, 16))
+    ProgSm = property(lambda self: _ip(self._buf, 20))
+    ProgPort = property(lambda self: _u16le(self._buf, 24))
+    Status = property(lambda self: self._buf[26])
+    ProgDg = property(lambda self: _ip(self._buf, 28))
+
+
+class ArtAddressView(PacketView):
+    __slots__ = ()
+    MIN_LENGTH = 107
+    FIELDS = ("ProtVer", "NetSwitch", "BindIndex", "ShortName", "LongName", "SwIn", "SwOut", "SubSwitch",
+              "AcnPriority", "Command")
+
+    NetSwitch = property(lambda self: self._buf[12])
+    BindIndex = property(lambda self: self._buf[13])
+    ShortName = property(lambda self: _string(self._buf, 14, 32))
+    LongName = property(lambda self: _string(self._buf, 32, 96))
+    SwIn = property(lambda self: list(self._buf[96:100]))
+    SwOut = property(lambda self: list(self._buf[100:104]))
+    SubSwitch = property(lambda self: self._buf[104])
+    AcnPriority = property(lambda self: self._buf[105])
+    Command = property(lambda self: self._buf[106])
+
+
+# Lazily decoded alternatives to the ARTNET_REPLY_PARSER functions.
+# ArtTrigger and ArtCommand are left out, their dicts are smaller and faster to build than a view.
+ARTNET_PACKET_VIEWS = {
+    OpCode.ArtPoll: ArtPollView,
+    OpCode.ArtPollReply: ArtPollReplyView,
+    OpCode.ArtDmx: ArtDmxView,
+    OpCode.ArtNzs: ArtNzsView,
+    OpCode.ArtSync: ArtSyncView,
+    OpCode.ArtIpProg: ArtIpProgView,
+    OpCode.ArtIpProgReply: ArtIpProgReplyView,
+    OpCode.ArtAddress: ArtAddressView,
+}
+
+
 def pack_ip(
     dhcp: bool = False,
     prog_ip: str | None = None,
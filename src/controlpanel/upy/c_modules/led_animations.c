@@ -0,0 +1,156 @@
+#include "py/dynruntime.h"
+
+// Native versions of the animations in controlpanel/shared/base/led_strip.py, which are the reference.
+// Both must produce exactly the same frames, so this only uses the same integer arithmetic.
+// Positions are in 1/256 LEDs and wrap at (led count << 10), see advance_position.
+
+#define ANIM_LOOPING_LINE 0
+#define ANIM_STROBE 1
+#define ANIM_GRADIENT 2
+#define ANIM_CHASE 3
+#define ANIM_TWINKLE 4
+#define ANIM_FIRE 5
+
+#define FIRE_COOLING 55
+#define FIRE_SPARKING 120
+
+static const uint8_t black[3] = {0, 0, 0};
+
+static inline void blend_into(uint8_t *out, const uint8_t *color1, const uint8_t *color2, uint32_t weight) {
+    uint32_t inverse = 256 - weight;
+    out[0] = (color1[0] * inverse + color2[0] * weight) >> 8;
+    out[1] = (color1[1] * inverse + color2[1] * weight) >> 8;
+    out[2] = (color1[2] * inverse + color2[2] * weight) >> 8;
+}
+
+static inline uint32_t hash16(uint32_t x) {
+    x &= 0xFFFF;
+    x = ((x ^ (x >> 8)) * 0x2D35u) & 0xFFFF;
+    x = ((x ^ (x >> 7)) * 0x3A8Du) & 0xFFFF;
+    return x ^ (x >> 8);
+}
+
+static inline uint32_t random8(uint32_t frame, uint32_t index, uint32_t salt) {
+    return hash16(hash16(frame) ^ (index << 2) ^ salt) & 0xFF;
+}
+
+static void looping_line(uint8_t *buf, size_t n, uint32_t position, const uint8_t *c1, const uint8_t *c2) {
+    uint32_t total = n << 8;
+    uint32_t offset = position % total;
+    for (size_t i = 0; i < n; i++) {
+        uint32_t dist = ((i << 8) + total - offset) % total;
+        uint32_t fade = dist / 3 >= 256 ? 0 : 256 - dist / 3;
+        blend_into(buf + 3 * i, c2, c1, fade);
+    }
+}
+
+static void fill(uint8_t *buf, size_t n, const uint8_t *color) {
+    for (size_t i = 0; i < n; i++) {
+        *buf++ = color[0];
+        *buf++ = color[1];
+        *buf++ = color[2];
+    }
+}
+
+static void gradient(uint8_t *buf, size_t n, uint32_t position, const uint8_t *c1, const uint8_t *c2) {
+    uint32_t total = n << 8;
+    uint32_t offset = position % total;
+    for (size_t i = 0; i < n; i++) {
+        uint32_t fraction = 2 * (((i << 8) + offset) % total) / n;
+        blend_into(buf + 3 * i, c1, c2, fraction <= 256 ? fraction : 512 - fraction);
+    }
+}
+
+static void chase(uint8_t *buf, size_t n, uint32_t position, const uint8_t *c1, const uint8_t *c2) {
+    uint32_t lit = ((position % (n << 8)) >> 8) % 3;
+    for (size_t i = 0; i < n; i++) {
+        const uint8_t *color = i % 3 == lit ? c1 : c2;
+        buf[3 * i] = color[0];
+        buf[3 * i + 1] = color[1];
+        buf[3 * i + 2] = color[2];
+    }
+}
+
+static void twinkle(uint8_t *buf, size_t n, uint32_t position, const uint8_t *c1, const uint8_t *c2) {
+    for (size_t i = 0; i < n; i++) {
+        uint32_t phase = (position + hash16(i)) & 0x3FF;
+        uint32_t level = phase < 512 ? phase >> 1 : (1023 - phase) >> 1;
+        blend_into(buf + 3 * i, c2, c1, (level * level) >> 8);
+    }
+}
+
+static void fire(uint8_t *buf, size_t n, uint32_t frame, uint8_t *heat, const uint8_t *c1, const uint8_t *c2) {
+    uint32_t cooling = (FIRE_COOLING * 10) / n + 2;
+    for (size_t i = 0; i < n; i++) {
+        uint32_t cool = random8(frame, i, 0) % cooling;
+        heat[i] = heat[i] > cool ? heat[i] - cool : 0;
+    }
+    for (size_t k = n - 1; k >= 2; k--) {
+        heat[k] = (heat[k - 1] + 2 * heat[k - 2]) / 3;
+    }
+    if (random8(frame, 0, 1) < FIRE_SPARKING) {
+        uint32_t y = random8(frame, 0, 2) % (n < 7 ? n : 7);
+        uint32_t spark = heat[y] + 160 + random8(frame, 0, 3) % 96;
+        heat[y] = spark > 255 ? 255 : spark;
+    }
+    for (size_t i = 0; i < n; i++) {
+        uint32_t temperature = heat[i];
+        if (temperature < 128) {
+            blend_into(buf + 3 * i, black, c1, temperature << 1);
+        } else {
+            blend_into(buf + 3 * i, c1, c2, (temperature - 128) << 1);
+        }
+    }
+}
+
+// --- render(index, buf, frame, position, colors, scratch) ---
+// Renders a single frame of the animation with the given index into buf (3 bytes per LED).
+// colors holds color1 followed by color2, scratch must have a byte per LED and is kept between frames.
+static mp_obj_t render(size_t n_args, const mp_obj_t *args) {
+    mp_int_t index = mp_obj_get_int(args[0]);
+    mp_buffer_info_t buf_info;
+    mp_buffer_info_t colors_info;
+    mp_buffer_info_t scratch_info;
+    mp_get_buffer_raise(args[1], &buf_info, MP_BUFFER_WRITE);
+    uint32_t frame = mp_obj_get_int(args[2]);
+    uint32_t position = mp_obj_get_int(args[3]);
+    mp_get_buffer_raise(args[4], &colors_info, MP_BUFFER_READ);
+    mp_get_buffer_raise(args[5], &scratch_info, MP_BUFFER_WRITE);
+
+    uint8_t *buf = (uint8_t *)buf_info.buf;
+    size_t n = buf_info.len / 3;
+    const uint8_t *c1 = (const uint8_t *)colors_info.buf;
+    const uint8_t *c2 = c1 + 3;
+
+    if (colors_info.len < 6) {
+        mp_raise_ValueError(MP_ERROR_TEXT("colors must hold two RGB colors"));
+    }
+    if (scratch_info.len < n) {
+        mp_raise_ValueError(MP_ERROR_TEXT("scratch buffer too small"));
+    }
+    if (n == 0) {
+        return mp_const_none;
+    }
+
+    switch (index) {
+        case ANIM_LOOPING_LINE: looping_line(buf, n, position, c1, c2); break;
+        case ANIM_STROBE: fill(buf, n, frame & 1 ? c2 : c1); break;
+        case ANIM_GRADIENT: gradient(buf, n, position, c1, c2); break;
+        case ANIM_CHASE: chase(buf, n, position, c1, c2); break;
+        case ANIM_TWINKLE: twinkle(buf, n, position, c1, c2); break;
+        case ANIM_FIRE: fire(buf, n, frame, (uint8_t *)scratch_info.buf, c1, c2); break;
+        default: mp_raise_ValueError(MP_ERROR_TEXT("unknown animation"));
+    }
+
+    return mp_const_none;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(render_obj, 6, 6, render);
+
+// --- Module init function ---
+mp_obj_t mpy_init(mp_obj_fun_bc_t *self, size_t n_args, size_t n_kw, mp_obj_t *args) {
+    MP_DYNRUNTIME_INIT_ENTRY
+
+    mp_store_global(MP_QSTR_render, MP_OBJ_FROM_PTR(&render_obj));
+
+    MP_DYNRUNTIME_INIT_EXIT
+}
@@ -0,0 +1,54 @@
+#include "py/dynruntime.h"
+
+// Each changed bit is written as a little-endian uint16: (bit index << 1) | new bit value.
+// The bit index counts LSB first, bit b of byte i has the index 8 * i + b.
+
+// --- The main function exposed to Python ---
+// Returns the number of changed bits written to out, or -1 if they don't fit (out holds len(out) / 2 of them).
+static mp_obj_t diff_into(mp_obj_t out_obj, mp_obj_t current_obj, mp_obj_t previous_obj) {
+    mp_buffer_info_t out_info;
+    mp_buffer_info_t cur_info;
+    mp_buffer_info_t prev_info;
+    mp_get_buffer_raise(out_obj, &out_info, MP_BUFFER_WRITE);
+    mp_get_buffer_raise(current_obj, &cur_info, MP_BUFFER_READ);
+    mp_get_buffer_raise(previous_obj, &prev_info, MP_BUFFER_READ);
+
+    if (cur_info.len != prev_info.len) {
+        mp_raise_ValueError(MP_ERROR_TEXT("buffers differ in length"));
+    }
+
+    uint8_t *out = (uint8_t *)out_info.buf;
+    const uint8_t *cur = (const uint8_t *)cur_info.buf;
+    const uint8_t *prev = (const uint8_t *)prev_info.buf;
+    size_t n = cur_info.len;
+    size_t capacity = out_info.len / 2;
+    size_t count = 0;
+
+    for (size_t i = 0; i < n; i++) {
+        uint8_t changed = cur[i] ^ prev[i];
+        // Only visits the set bits, so the work is proportional to the number of changes
+        while (changed) {
+            if (count == capacity) {
+                return MP_OBJ_NEW_SMALL_INT(-1);
+            }
+            int bit = __builtin_ctz(changed);
+            changed &= changed - 1;
+            uint16_t entry = (uint16_t)(((i * 8 + bit) << 1) | ((cur[i] >> bit) & 1));
+            *out++ = entry & 0xFF;
+            *out++ = entry >> 8;
+            count++;
+        }
+    }
+
+    return MP_OBJ_NEW_SMALL_INT(count);
+}
+static MP_DEFINE_CONST_FUN_OBJ_3(diff_into_obj, diff_into);
+
+// --- Module init function ---
+mp_obj_t mpy_init(mp_obj_fun_bc_t *self, size_t n_args, size_t n_kw, mp_obj_t *args) {
+    MP_DYNRUNTIME_INIT_ENTRY
+
+    mp_store_global(MP_QSTR_diff_into, MP_OBJ_FROM_PTR(&diff_into_obj));
+
+    MP_DYNRUNTIME_INIT_EXIT
+}
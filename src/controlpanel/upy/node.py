@@ -1,9 +1,10 @@
 import utils
-from machine import reset, SoftSPI, I2C
+from machine import reset, SoftSPI, SPI, I2C
 from controlpanel.upy import phys
 from controlpanel.upy.artnet import ArtNet, OpCode
-from controlpanel.shared.base import Device
+from controlpanel.shared.base import Device, LinkQuality
 from controlpanel.upy.phys import Fixture, Sensor
+from controlpanel.upy.scheduler import DeviceScheduler
 from controlpanel.shared.compatibility import Callable
 import time
 import uasyncio as asyncio
@@ -15,20 +16,29 @@ class Node:
     def __init__(self):
         self._name = utils.get_hostname()
         self._artnet = ArtNet()
-        self._artnet.subscribe(OpCode.ArtDmx, self.artdmx_callback)
+        self._artnet.subscribe_artdmx(self.artdmx_callback)
         self._artnet.subscribe(OpCode.ArtCommand, self.artcmd_callback)
         self._artnet.subscribe(OpCode.ArtPoll, self.artpoll_callback)
+        self._artnet.subscribe(OpCode.ArtSync, self.artsync_callback)
         self.commands: dict[str, Callable] = {
             "RESET": reset,
             "STOP": self._stop_updating_devices,
-            "PING": lambda: self._artnet.send_command(b"RETURN_PING"),
+            "PING": self._return_ping,
+            "LINK": self._print_link_quality,
+            "RATE": self._set_update_rate,
+            "SCHED": self._print_scheduler_stats,
         }
         manifest = self._parse_manifest()
-        self._spi: SoftSPI | None = self._instantiate_spi(manifest)
+        # Whether DMX packets are acknowledged and triggers retransmitted until the host acknowledges them
+        self._acknowledge: bool = manifest.get("acknowledge", False)
+        self.link: LinkQuality = LinkQuality()
+        self._spi: SoftSPI | SPI | None = self._instantiate_spi(manifest)
         self._i2c: I2C | None = self._instantiate_i2c(manifest)
         self.devices: dict[str, Device] = self._instantiate_devices(manifest)
         self.universes: dict[int, Fixture] = {
-            device.universe: device for device in self.devices.values() if isinstance(device, Fixture)
+            universe: device
+            for device in self.devices.values() if isinstance(device, Fixture)
+            for universe in device.universes
         }
         self.fixtures: dict[str, Fixture] = {
             device.name: device for device in self.devices.values() if isinstance(device, Fixture)
@@ -36,8 +46,11 @@ class Node:
         self.sensors: dict[str, Sensor] = {
             device.name: device for device in self.devices.values() if isinstance(device, Sensor)
         }
+        if self._acknowledge:
+            for sensor in self.sensors.values():
+                sensor._link = self.link
 
-        self._update_devices: bool = True
+        self.scheduler: DeviceScheduler = DeviceScheduler(self.devices)
 
     def _parse_manifest(self) -> dict[str, dict]:
         manifest = utils.load_json('controlpanel/shared/device_manifest.json')
@@ -46,10 +59,21 @@ class Node:
         return manifest.get(self._name, {})
 
     @staticmethod
-    def _instantiate_spi(config: dict[str, dict]) -> SoftSPI | None:
+    def _instantiate_spi(config: dict[str, dict]) -> SoftSPI | SPI | None:
+        """Uses the hardware SPI host with the given "id" (1: HSPI, 2: VSPI) if there is one, else bit-bangs."""
         spi_config = config.get("spi")
         if not spi_config:
             return None
+        if spi_config.get("id") is not None:
+            return SPI(
+                spi_config["id"],
+                baudrate=spi_config.get("baudrate") or 1_000_000,
+                sck=spi_config["sck"],
+                mosi=spi_config["mosi"],
+                miso=spi_config["miso"],
+                phase=spi_config.get("phase") or 0,
+                polarity=spi_config.get("polarity") or 0,
+            )
         return SoftSPI(
             sck=spi_config["sck"],
             mosi=spi_config["mosi"],
@@ -84,21 +108,28 @@ class Node:
 
     def _stop_updating_devices(self):
         print("Stopping device updates...")
-        self._update_devices = False
+        self.scheduler.running = False
 
-    async def _update_device(self, device: Sensor | Fixture):
-        while self._update_devices:
-            await device.update()
-            await asyncio.sleep_ms(device.update_rate_ms)
+    def _set_update_rate(self, device_name: str, rate_hz: str):
+        """Handle a 'RATE <device name> <Hz>' command, a rate of 0 stops updating the device."""
+        if not self.scheduler.set_rate(device_name, float(rate_hz)):
+            print(f"Unknown device '{device_name}'")
+
+    def _print_scheduler_stats(self):
+        self.scheduler.print_stats()
 
     async def update_all_devices(self):
-        tasks = [
-            self._update_device(device)
-            for device in self.devices.values()
-            if device.update_rate_ms > 0
-        ]
-        tasks.append(self.connection_watchdog())
-        await asyncio.gather(*tasks)
+        await asyncio.gather(self.scheduler.run(), self.connection_watchdog(), self.sync_watchdog())
+
+    async def sync_watchdog(self, sleep_ms: int = 500):
+        """Falls back to immediate mode if the host stopped sending ArtSync, outputting any data that is still held back."""
+        while True:
+            if Fixture.sync_timed_out():
+                print("No ArtSync received for a while, leaving sync mode.")
+                Fixture.leave_sync_mode()
+                for fixture in self.fixtures.values():
+                    fixture.latch()
+            await asyncio.sleep_ms(sleep_ms)
 
     async def connection_watchdog(self, sleep_ms: int = 10_000, retries: int = 5):
         attempt = 0
@@ -121,23 +152,49 @@ class Node:
 
 
     def artcmd_callback(self, op_code: OpCode, ip: str, port: int, reply):
-        command = reply.get("Command")
+        command, *args = reply.get("Command").split(" ")
+        if command == "ACK":
+            self._acknowledge_trigger(*args)
+            return
         func = self.commands.get(command)
         if func:
-            print(f"Received command {command}")
-            func()
+            if command != "PING":  # the host pings continuously
+                print(f"Received command {command}")
+            try:
+                func(*args)
+            except (TypeError, ValueError):
+                print(f"Invalid arguments for command {command}: {args}")
         else:
             print("Received unknown command: {}".format(command))
 
-    def artdmx_callback(self, op_code: OpCode, ip: str, port: int, reply):
-        universe: int = reply.get("Universe")
-        seq: int = reply.get("Sequence")
-        data: bytearray = reply.get("Data")
+    def _acknowledge_trigger(self, sensor_name: str = "", seq: str = "0"):
+        """Handle an 'ACK <sensor name> <seq>' command the host sends for every trigger it received."""
+        sensor: Sensor | None = self.sensors.get(sensor_name)
+        if sensor is not None and seq.isdigit():
+            sensor.acknowledge(int(seq))
+
+    def _return_ping(self, nonce: str | None = None):
+        """Reply to a ping, echoing its nonce so the host can tell which ping the reply belongs to"""
+        self._artnet.send_command(b"RETURN_PING " + nonce.encode() if nonce else b"RETURN_PING")
+
+    def _print_link_quality(self):
+        link = self.link
+        print(f"Loss: {100 * link.loss:.1f}% | Sent: {link.sent} | Acknowledged: {link.acknowledged} | "
+              f"Retransmitted: {link.retransmitted} | Retransmits: {link.retransmits()}")
+
+    def artdmx_callback(self, universe: int, seq: int, data: memoryview):
         fixture: Fixture | None = self.universes.get(universe)
-        if fixture is None or fixture.should_ignore_seq(seq):
+        if fixture is None:
             return
-        fixture._seq = seq
-        fixture.parse_dmx_data(data)
+        fixture.receive_dmx(universe, seq, data)
+        if self._acknowledge:
+            # Acknowledge duplicates too, as the previous acknowledgement may have been lost
+            self._artnet.send_command(b"ACK %d %d" % (universe, seq))
+
+    def artsync_callback(self, op_code: OpCode, ip: str, port: int, reply):
+        Fixture.notify_sync()
+        for fixture in self.fixtures.values():
+            fixture.latch()
 
     def artpoll_callback(self, op_code: OpCode, ip: str, port: int, reply):
         self._artnet.address = (ip, port)
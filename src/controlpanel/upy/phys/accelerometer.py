@@ -2,11 +2,11 @@ import machine
 from .sensor import Sensor
 from controlpanel.upy.artnet import ArtNet
 from controlpanel.upy.libs.MPU6050 import MPU6050
-import struct
 from micropython import const
 
 
 _DEFAULT_POLLING_RATE_HZ = const(5)
+_DEFAULT_MAX_REPORT_INTERVAL_MS = const(5000)
 
 
 class Accelerometer(Sensor):
@@ -16,9 +16,26 @@ class Accelerometer(Sensor):
             _name: str,
             *,
             polling_rate_hz: float = _DEFAULT_POLLING_RATE_HZ,
+            deadband: float | None = None,
+            min_report_interval_ms: int = 0,
+            max_report_interval_ms: int = _DEFAULT_MAX_REPORT_INTERVAL_MS,
     ) -> None:
+        """Without a deadband, every reading is sent. With a deadband (in °/s), a reading is only sent if any axis
+        differs from the last sent reading by more than the deadband, rate limited by the report intervals."""
         super().__init__(_context[0], _name, polling_rate_hz)
         self.mpu6050 = MPU6050(_context[2])
+        self._deadband: float | None = deadband
+        self._reported_gyro: tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self._configure_reporting(min_report_interval_ms, max_report_interval_ms)
 
     async def update(self) -> None:
-        self._send_trigger_packet(struct.pack("<3e", *self.mpu6050.read_gyro_data()))
+        gyro = self.mpu6050.read_gyro_data()
+        if self._deadband is not None:
+            reported = self._reported_gyro
+            changed = (abs(gyro[0] - reported[0]) > self._deadband
+                       or abs(gyro[1] - reported[1]) > self._deadband
+                       or abs(gyro[2] - reported[2]) > self._deadband)
+            if not self._report_due(changed):
+                return
+            self._reported_gyro = gyro
+        self._pack_trigger_packet("<3e", *gyro)
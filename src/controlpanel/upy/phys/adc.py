@@ -2,11 +2,14 @@ import machine
 from .sensor import Sensor
 from controlpanel.upy.artnet import ArtNet
 from controlpanel.shared.compatibility import Literal
-import struct
 from micropython import const
 
 
 _DEFAULT_POLLING_RATE_HZ = const(2.0)
+_DEFAULT_MAX_REPORT_INTERVAL_MS = const(5000)
+# The EMA is computed in fixed point, so that it doesn't allocate floats on every poll
+_EMA_VALUE_SHIFT = const(4)
+_EMA_WEIGHT_SHIFT = const(8)
 
 
 class ADC(Sensor):
@@ -18,11 +21,59 @@ class ADC(Sensor):
             *,
             polling_rate_hz: float = _DEFAULT_POLLING_RATE_HZ,
             attenuation: Literal[0, 1, 2, 3] = machine.ADC.ATTN_11DB,
+            deadband: int | None = None,
+            min_report_interval_ms: int = 0,
+            max_report_interval_ms: int = _DEFAULT_MAX_REPORT_INTERVAL_MS,
+            oversampling: int = 1,
+            oversampling_filter: Literal["mean", "median"] = "mean",
+            ema_alpha: float | None = None,
     ) -> None:
+        """Every poll, the ADC is read oversampling times and the samples are combined by their mean or median.
+        If ema_alpha is set, the result is smoothed across polls by an exponential moving average (smaller is smoother).
+        Without a deadband, every reading is sent. With a deadband (in raw u16 units), a reading is only sent if it
+        differs from the last sent one by more than the deadband, rate limited by the report intervals."""
         super().__init__(_context[0], _name, polling_rate_hz)
         self.adc = machine.ADC(machine.Pin(pin))
         self.adc.atten(attenuation)
+        assert oversampling >= 1, "oversampling must be at least 1"
+        assert oversampling_filter in ("mean", "median"), f"Unknown oversampling filter {oversampling_filter}"
+        self._samples: list[int] = [0] * oversampling
+        self._use_median: bool = oversampling_filter == "median"
+        self._ema_weight: int = 0 if ema_alpha is None else max(1, min(1 << _EMA_WEIGHT_SHIFT,
+                                                                       int(ema_alpha * (1 << _EMA_WEIGHT_SHIFT))))
+        self._ema: int | None = None  # shifted left by _EMA_VALUE_SHIFT
+        self._deadband: int | None = deadband
+        self._reported_value: int = 0
+        self._configure_reporting(min_report_interval_ms, max_report_interval_ms)
+
+    def _read(self) -> int:
+        samples = self._samples
+        count = len(samples)
+        if count == 1:
+            value = self.adc.read_u16()
+        elif self._use_median:
+            for i in range(count):
+                samples[i] = self.adc.read_u16()
+            samples.sort()
+            value = samples[count // 2]
+        else:
+            total = 0
+            for _ in range(count):
+                total += self.adc.read_u16()
+            value = total // count
+
+        if not self._ema_weight:
+            return value
+        if self._ema is None:
+            self._ema = value << _EMA_VALUE_SHIFT
+        else:
+            self._ema += (self._ema_weight * ((value << _EMA_VALUE_SHIFT) - self._ema)) >> _EMA_WEIGHT_SHIFT
+        return self._ema >> _EMA_VALUE_SHIFT
 
     async def update(self) -> None:
-        value = self.adc.read_u16()
-        self._send_trigger_packet(struct.pack(">H", value))
+        value = self._read()
+        if self._deadband is not None:
+            if not self._report_due(abs(value - self._reported_value) > self._deadband):
+                return
+            self._reported_value = value
+        self._pack_trigger_packet(">H", value)
@@ -1,4 +1,3 @@
-import struct
 from controlpanel.upy.phys import Sensor
 from machine import Pin, SoftSPI, I2C
 from controlpanel.upy.artnet import ArtNet
@@ -50,4 +49,4 @@ class BananaPlugs(Sensor):
                 new_connections.append((plug_idx, connected_socket_idx))
 
         for plug_idx, socket_idx in new_connections:
-            self._send_trigger_packet(struct.pack('BB', plug_idx, socket_idx))
+            self._pack_trigger_packet('BB', plug_idx, socket_idx)
@@ -10,6 +10,8 @@ _DEFAULT_POLLING_RATE_HZ: float = const(0.0)
 
 
 class Button(Sensor):
+    irq_driven = True
+
     def __init__(
             self,
             _context: tuple[ArtNet, SoftSPI, I2C],
@@ -25,6 +27,8 @@ class Button(Sensor):
         self.pin.irq(trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING, handler=self._handle_interrupt)
         self._invert = invert
         self._previous_state: bool = self.get_pressed()
+        self._irq_state: bool = self._previous_state
+        self._irq_edges: int = 0  # debounced edges since the last update
         self._software_debounce_ms = software_debounce_ms
         if software_debounce_ms:
             self._last_press_time: int = 0
@@ -41,14 +45,27 @@ class Button(Sensor):
             self._last_press_time = current_time
         else:
             return
-        self._previous_state = value
-        self._send_trigger_packet(value.to_bytes(1, "big"))
+        self._irq_state = value
+        self._irq_edges += 1
+        self._notify()
 
     def get_pressed(self) -> bool:
         return self.pin.value() ^ self._invert
 
     async def update(self) -> None:
-        state = self.get_pressed()
-        if state != self._previous_state:
-            self._previous_state = state
-            self._send_trigger_packet(state.to_bytes(1, "big"))
+        if self._irq_edges:
+            edges, self._irq_edges = self._irq_edges, 0
+            state = self._irq_state
+            if state == self._previous_state:
+                if edges < 2:
+                    return
+                # Pressed and released (or the other way around) before the scheduler got to it. Both states go into
+                # a single packet, as a second packet would cancel the retransmits of the first one.
+                self._pack_trigger_packet("BB", not state, state)
+                return
+        else:
+            state = self.get_pressed()
+            if state == self._previous_state:
+                return
+        self._previous_state = state
+        self._pack_trigger_packet("B", state)
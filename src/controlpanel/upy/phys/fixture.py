@@ -1,12 +1,64 @@
+from time import ticks_ms, ticks_diff
+from micropython import const
 from controlpanel.shared.base import Device, BaseFixture
 from controlpanel.shared.compatibility import abstractmethod
 from controlpanel.upy.artnet import ArtNet
 
 
+_SYNC_TIMEOUT_MS = const(4000)  # Art-Net 4: fall back to immediate mode if no ArtSync arrived for 4s
+
+
 class Fixture(BaseFixture):
+    _last_sync_ms: int | None = None  # shared by all fixtures, set by the node whenever an ArtSync arrives
+
     def __init__(self, _artnet: ArtNet, _name: str, update_rate_hz, *, universe: int | None) -> None:
         super().__init__(_artnet, _name, universe=universe)
         self.update_rate_ms: int = int(1000 / update_rate_hz) if update_rate_hz > 0.0 else 0
+        self._pending_dmx: bytearray | None = None  # allocated once, on the first packet received in sync mode
+        self._pending_length: int = 0
+
+    @staticmethod
+    def notify_sync() -> None:
+        Fixture._last_sync_ms = ticks_ms()
+
+    @staticmethod
+    def sync_timed_out() -> bool:
+        """Whether the node was in sync mode, but has not received an ArtSync for too long."""
+        last_sync_ms = Fixture._last_sync_ms
+        return last_sync_ms is not None and ticks_diff(ticks_ms(), last_sync_ms) >= _SYNC_TIMEOUT_MS
+
+    @staticmethod
+    def leave_sync_mode() -> None:
+        Fixture._last_sync_ms = None
+
+    @staticmethod
+    def in_sync_mode() -> bool:
+        """Whether DMX data should be held back until the next ArtSync instead of being applied immediately."""
+        last_sync_ms = Fixture._last_sync_ms
+        return last_sync_ms is not None and ticks_diff(ticks_ms(), last_sync_ms) < _SYNC_TIMEOUT_MS
+
+    def receive_dmx(self, universe: int, seq: int, data: memoryview) -> None:
+        """Called by the node for every ArtDmx packet on one of this fixture's universes.
+        In sync mode, the data is copied into a buffer and only applied on the next ArtSync."""
+        if self.should_ignore_seq(seq):
+            return
+        self._seq = seq
+        if not self.in_sync_mode():
+            self._pending_length = 0
+            self.parse_dmx_data(data)
+            return
+        if self._pending_dmx is None:
+            self._pending_dmx = bytearray(512)
+        length = min(len(data), len(self._pending_dmx))
+        self._pending_dmx[:length] = data[:length]  # data is only valid during the callback
+        self._pending_length = length
+
+    def latch(self) -> None:
+        """Output the data that was received since the last latch. Called by the node on ArtSync."""
+        if not self._pending_length:
+            return
+        length, self._pending_length = self._pending_length, 0
+        self.parse_dmx_data(memoryview(self._pending_dmx)[:length])
 
     @abstractmethod
     async def update(self) -> None:
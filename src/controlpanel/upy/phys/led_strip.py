@@ -1,10 +1,21 @@
 import neopixel
 from machine import Pin, SoftSPI, I2C
-from controlpanel.shared.base.led_strip import BaseLEDStrip, Generator, Literal, Animation
+from controlpanel.shared.base.led_strip import BaseLEDStrip, Generator, Literal, Animation, FRAME_TYPE_PIXELS, FRAME_TYPE_DELTA
+from controlpanel.shared.base.led_strip import animation_step, advance_position, COMPRESSION_HSL
 from .fixture import Fixture
 from micropython import const
 from controlpanel.upy.artnet import ArtNet
 from controlpanel.upy.c_modules import rgb_decompression
+try:
+    from controlpanel.upy.c_modules import hsl_decompression
+except ImportError:
+    print("hsl_decompression.mpy is missing, LED strips can't use HSL compression")
+    hsl_decompression = None  # not built for this node, use_compression="hsl" is refused
+try:
+    from controlpanel.upy.c_modules import led_animations
+except ImportError:
+    print("led_animations.mpy is missing, animations are rendered in Python")
+    led_animations = None  # not built for this node, the animations run in Python
 
 
 _BITMASK_RED = const(0b11100000)
@@ -24,6 +35,33 @@ _SECONDARY_COLOR_OFFSET = const(_PRIMARY_COLOR_OFFSET + _PRIMARY_COLOR_BYTES)
 _SECONDARY_COLOR_BYTES = const(3)
 _TOTAL_ANIM_BYTES = const(_SECONDARY_COLOR_OFFSET + _SECONDARY_COLOR_BYTES)
 
+_DELTA_KEYFRAME_SEQ_OFFSET = const(1)
+_DELTA_RUNS_OFFSET = const(2)
+_DELTA_RUN_HEADER_BYTES = const(3)
+
+_FRAME_MASK = const(0xFFFF)
+
+
+def _native_animation(index: int,
+                      update_rate_ms: int,
+                      buf: bytearray,
+                      speed: float,
+                      color1: tuple[int, int, int],
+                      color2: tuple[int, int, int],
+                      ) -> Generator[None, None, None]:
+    """Renders the animation with the given index of BaseLEDStrip.ANIMATIONS with led_animations.c, frame by frame."""
+    step = animation_step(update_rate_ms, speed)
+    led_count = len(buf) // 3
+    colors = bytes(color1) + bytes(color2)
+    scratch = bytearray(led_count)  # state that is kept between frames, e.g. the heat of the fire
+    frame = 0
+    position = 0
+    while True:
+        led_animations.render(index, buf, frame, position, colors, scratch)
+        yield None
+        frame = (frame + 1) & _FRAME_MASK
+        position = advance_position(position, step, led_count)
+
 
 class LEDStrip(BaseLEDStrip, Fixture):
     def __init__(self,
@@ -33,23 +71,39 @@ class LEDStrip(BaseLEDStrip, Fixture):
                  length: int,
                  *,
                  universe: int | None = None,
-                 use_compression: bool = False,
+                 use_compression: bool | Literal["hsl"] = False,
                  update_rate_hz: float = 1.0,
                  rgb_order: Literal["RGB", "RBG", "GRB", "GBR", "BRG", "BGR"] = "RGB",  # used for animations
                  primary_animation_color: list[int] | None = None,
                  secondary_animation_color: list[int] | None = None,
                  ) -> None:
+        if use_compression == COMPRESSION_HSL and hsl_decompression is None:
+            # Decoding HSL in Python would be far slower than the RGB332 compression it is meant to replace
+            raise ValueError("use_compression='hsl' needs hsl_decompression.mpy on the node")
         BaseLEDStrip.__init__(self, rgb_order)
         Fixture.__init__(self, _context[0], _name, update_rate_hz, universe=universe)
         self._neopixels: neopixel.NeoPixel = neopixel.NeoPixel(Pin(pin, Pin.OUT), length)
-        self._use_compression = use_compression
+        self._bytes_per_pixel: int = self.bytes_per_pixel(use_compression)
         self._animation: Generator[bytearray, None, None] | None = None
         self._primary_animation_color: list[int] = primary_animation_color or [100, 0, 0]
         self._secondary_animation_color: list[int] = secondary_animation_color or [0, 100, 0]
 
+        # Strips that don't fit into a single universe are split across consecutive universes
+        self._pixels_per_universe: int = self.pixels_per_universe(use_compression)
+        self._segment_count: int = max(1, (length + self._pixels_per_universe - 1) // self._pixels_per_universe)
+        self._segment_seqs: list[int] = [0] * self._segment_count
+        self._keyframe_seqs: list[int] = [0] * self._segment_count  # delta frames are only applied on top of these
+        self._frame_seq: int = 0  # seq of the frame whose segments are currently being received
+        self._received_segments: int = 0  # bitmask of the segments of that frame that have arrived
+        self._pending: bool = False  # pixel data has been written to the buffer, but not yet to the strip
+
     def __len__(self):
         return len(self._neopixels)
 
+    @property
+    def universes(self) -> tuple[int, ...]:
+        return tuple(range(self._universe, self._universe + self._segment_count))
+
     @staticmethod
     def _uncompress_rgb_into(buffer: bytearray, compressed: bytes | memoryview) -> None:
         """
@@ -72,15 +126,47 @@ class LEDStrip(BaseLEDStrip, Fixture):
             buffer[3 * i + 1] = g
             buffer[3 * i + 2] = b
 
+    def receive_dmx(self, universe: int, seq: int, data: memoryview) -> None:
+        segment = universe - self._universe
+        if not 0 <= segment < self._segment_count or self.is_outdated_seq(self._segment_seqs[segment], seq):
+            return
+        self._segment_seqs[segment] = seq
+        self._seq = seq
+        self._parse_segment(segment, data)
+        if not self._pending:
+            return
+        if seq != self._frame_seq:
+            self._frame_seq = seq
+            self._received_segments = 0
+        self._received_segments |= 1 << segment
+        # In sync mode, all segments are latched together on the next ArtSync
+        if self._received_segments == (1 << self._segment_count) - 1 and not self.in_sync_mode():
+            self.latch()
+
     def parse_dmx_data(self, data: bytes):
-        animation_byte = data[0]
-        if animation_byte == 0:
+        self._parse_segment(0, data)
+        self.latch()
+
+    def latch(self) -> None:
+        if self._pending:
+            self._pending = False
+            self._neopixels.write()
+
+    def _parse_segment(self, segment: int, data: bytes | memoryview):
+        frame_type = data[0]
+        if frame_type == FRAME_TYPE_PIXELS:
             self._animation = None
             if len(data) == 1:
                 return
             else:
-                self._parse_pixel_data(memoryview(data)[1:])
+                self._parse_pixel_data(segment, memoryview(data)[1:])
+                self._keyframe_seqs[segment] = self._seq
+        elif frame_type == FRAME_TYPE_DELTA:
+            self._parse_delta_data(segment, memoryview(data))
         else:
+            for i in range(self._segment_count):
+                self._keyframe_seqs[i] = 0
+            self._pending = False
             self._parse_animation_data(data)
 
     def _parse_animation_data(self, animation_data: bytes | memoryview):
@@ -96,6 +182,15 @@ class LEDStrip(BaseLEDStrip, Fixture):
         secondary_color: tuple[int, int, int] = (animation_data[_SECONDARY_COLOR_OFFSET],
                                                  animation_data[_SECONDARY_COLOR_OFFSET + 1],
                                                  animation_data[_SECONDARY_COLOR_OFFSET + 2])
+        if led_animations is not None:
+            self._animation = _native_animation(animation_index,
+                                                self.update_rate_ms,
+                                                self._neopixels.buf,
+                                                animation_speed,
+                                                primary_color,
+                                                secondary_color,
+                                                )
+            return
         self._animation = animation(self.update_rate_ms,
                                     self._neopixels.buf,
                                     animation_speed,
@@ -105,14 +200,43 @@ class LEDStrip(BaseLEDStrip, Fixture):
         # TODO: mutable data structure to store animation speed and colors?
         # TODO: remove rgb ordering argument from phys class? (dummy can fix rgb order for animations too?)
 
-    def _parse_pixel_data(self, pixel_data: bytes | memoryview):
-        if not self._use_compression:
-            assert len(pixel_data) == 3 * len(self._neopixels), "length of pixel data must be 3 times the number of pixels"
-            self._neopixels.buf = bytearray(pixel_data)
+    def _parse_pixel_data(self, segment: int, pixel_data: bytes | memoryview):
+        start = segment * self._pixels_per_universe
+        count = min(self._pixels_per_universe, len(self._neopixels) - start)
+        assert len(pixel_data) == self._bytes_per_pixel * count, \
+            "length of pixel data must match the number of pixels in the segment"
+        self._write_pixels(start, count, pixel_data)
+        self._pending = True
+
+    def _write_pixels(self, start: int, count: int, pixel_data: bytes | memoryview) -> None:
+        """Decode pixels into the strip's buffer in place, pixel_data is only valid during the callback."""
+        buf = self._neopixels.buf
+        if self._bytes_per_pixel == 3:
+            buf[3 * start:3 * (start + count)] = pixel_data
+        elif self._bytes_per_pixel == 1:
+            rgb_decompression.uncompress_rgb_into(memoryview(buf)[3 * start:3 * (start + count)], pixel_data)
         else:
-            assert len(pixel_data) == len(self._neopixels), "length of pixel data must be equal to the number of pixels"
-            rgb_decompression.uncompress_rgb_into(self._neopixels.buf, pixel_data)
-        self._neopixels.write()
+            hsl_decompression.uncompress_hsl_into(memoryview(buf)[3 * start:3 * (start + count)], pixel_data)
+
+    def _parse_delta_data(self, segment: int, delta_data: memoryview):
+        """Apply runs of (u16 start pixel, u8 pixel count, pixel data) in place, if the keyframe they are based on is the
+        one that is currently displayed."""
+        if self._animation is not None or delta_data[_DELTA_KEYFRAME_SEQ_OFFSET] != self._keyframe_seqs[segment]:
+            return  # wait for the next keyframe
+        buf = self._neopixels.buf
+        bytes_per_pixel = self._bytes_per_pixel
+        i = _DELTA_RUNS_OFFSET
+        end = len(delta_data)
+        while i + _DELTA_RUN_HEADER_BYTES <= end:
+            start = (delta_data[i] << 8) | delta_data[i + 1]
+            count = delta_data[i + 2]
+            i += _DELTA_RUN_HEADER_BYTES
+            run = delta_data[i:i + count * bytes_per_pixel]
+            i += count * bytes_per_pixel
+            if 3 * (start + count) > len(buf) or len(run) != count * bytes_per_pixel:
+                return  # malformed, don't write outside of the strip
+            self._write_pixels(start, count, run)
+        self._pending = True
 
     async def update(self):
         if not self._animation:
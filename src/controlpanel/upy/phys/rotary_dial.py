@@ -13,6 +13,8 @@ _DEFAULT_DEBOUNCE: int = const(50)
 
 
 class RotaryDial(Sensor):
+    irq_driven = True
+
     def __init__(self,
                  _context: tuple[ArtNet, SoftSPI, I2C],
                  _name: str,
@@ -21,8 +23,9 @@ class RotaryDial(Sensor):
                  *,
                  software_debounce_ms: int | None = _DEFAULT_DEBOUNCE,
                  ) -> None:
-        super().__init__(_context[0], _name)
+        super().__init__(_context[0], _name, polling_rate_hz=0.0)  # only updated when a number has been dialed
         self._count: int = 0
+        self._dialed: int | None = None
         self._counter_switch = _Switch(pin_counter,
                                        trigger=self._increment_counter,
                                        software_debounce_ms=software_debounce_ms or 0
@@ -35,15 +38,18 @@ class RotaryDial(Sensor):
     def _confirm_count(self) -> None:
         if self._count == 0:
             return
-        self._count %= 10
-        self._send_trigger_packet(self._count.to_bytes(1, "big"))
+        self._dialed = self._count % 10
         self._count = 0
+        self._notify()
 
     def _increment_counter(self) -> None:
         self._count = (self._count + 1) % 255
 
     async def update(self) -> None:
-        pass
+        if self._dialed is None:
+            return
+        dialed, self._dialed = self._dialed, None
+        self._pack_trigger_packet("B", dialed)
 
 
 class _Switch:
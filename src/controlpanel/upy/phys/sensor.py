@@ -1,37 +1,128 @@
 import asyncio
-from controlpanel.shared.base import BaseSensor
+import struct
+from time import ticks_ms, ticks_diff
+from micropython import const
+from controlpanel.shared.base import BaseSensor, LinkQuality
 from controlpanel.shared.compatibility import abstractmethod
 from controlpanel.upy.artnet import ArtNet
+from controlpanel.upy.artnet.helper import pack_trigger, ARTTRIGGER_SUBKEY_OFFSET
+
+
+_ACK_TIMEOUT_MS = const(100)  # time to wait for an acknowledgement before the first retransmit, doubled each time
+_TRIGGER_KEY = const(76)
+_INITIAL_PAYLOAD_CAPACITY = const(8)  # enough for most sensors, the buffer grows if a payload doesn't fit
 
 
 class Sensor(BaseSensor):
+    irq_driven: bool = False  # whether the sensor's interrupt handlers call _notify, see DeviceScheduler
+
     def __init__(self, _artnet: ArtNet, _name: str, polling_rate_hz: float = 1.0):
         super().__init__(_artnet, _name)
         self.update_rate_ms: int = int(1000 / polling_rate_hz) if polling_rate_hz > 0.0 else 0
         self._current_task: asyncio.Task | None = None
+        self._link: LinkQuality | None = None  # set by the node if the host acknowledges triggers
+        self._acked_seq: int = 0
+        self._wake: asyncio.ThreadSafeFlag | None = None  # set by the scheduler for irq_driven sensors
+        self._irq_pending: bool = False
+
+        # The trigger packet is assembled once, only the sequence number and payload are patched in before sending
+        prefix = pack_trigger(_TRIGGER_KEY, 0, _name.encode('ascii') + b'\x00')
+        self._payload_offset: int = len(prefix)
+        self._trigger_packet: bytearray = bytearray(self._payload_offset + _INITIAL_PAYLOAD_CAPACITY)
+        self._trigger_packet[:self._payload_offset] = prefix
+        self._trigger_view: memoryview = memoryview(self._trigger_packet)[:self._payload_offset]
+
+    def _configure_reporting(self, min_report_interval_ms: int, max_report_interval_ms: int) -> None:
+        """Rate limit the reports of sensors that only report changes, see _report_due."""
+        self._min_report_interval_ms: int = min_report_interval_ms
+        self._max_report_interval_ms: int = max_report_interval_ms
+        self._last_report_ms: int | None = None
+
+    def _report_due(self, changed: bool) -> bool:
+        """Whether a reading should be sent. Changes are sent at most every min_report_interval_ms, and if nothing
+        changed, the last value is repeated every max_report_interval_ms as a heartbeat (never if it is 0)."""
+        now = ticks_ms()
+        if self._last_report_ms is not None:
+            elapsed = ticks_diff(now, self._last_report_ms)
+            if elapsed < self._min_report_interval_ms:
+                return False
+            if not changed and (not self._max_report_interval_ms or elapsed < self._max_report_interval_ms):
+                return False
+        self._last_report_ms = now
+        return True
+
+    def _notify(self) -> None:
+        """Called from interrupt handlers to have update() called as soon as possible, instead of sending from the
+        handler itself."""
+        self._irq_pending = True
+        if self._wake is not None:
+            self._wake.set()
 
     @abstractmethod
     async def update(self) -> None:
         pass
 
     def _send_trigger_packet(self, payload: bytes | bytearray) -> None:
-        data: bytes = self.name.encode('ascii') + b'\x00' + payload
+        length = self._reserve_payload(len(payload))
+        self._trigger_packet[self._payload_offset:length] = payload
+        self._send_trigger(length)
+
+    def _pack_trigger_packet(self, fmt: str, *values) -> None:
+        """Like _send_trigger_packet(struct.pack(fmt, *values)), but packs the values straight into the packet."""
+        length = self._reserve_payload(struct.calcsize(fmt))
+        struct.pack_into(fmt, self._trigger_packet, self._payload_offset, *values)
+        self._send_trigger(length)
+
+    def _reserve_payload(self, size: int) -> int:
+        """Make room for a payload of the given size and return the resulting packet length."""
+        length = self._payload_offset + size
+        if length > len(self._trigger_packet):
+            # Only happens if a sensor sends a larger payload than ever before
+            packet = bytearray(length)
+            packet[:self._payload_offset] = self._trigger_packet[:self._payload_offset]
+            self._trigger_packet = packet
+            self._trigger_view = memoryview(packet)[:self._payload_offset]
+        return length
 
+    def _send_trigger(self, length: int) -> None:
         self._increment_seq()
+        self._trigger_packet[ARTTRIGGER_SUBKEY_OFFSET] = self._seq
+        if len(self._trigger_view) != length:
+            self._trigger_view = memoryview(self._trigger_packet)[:length]
 
-        self._artnet.send_trigger(76, self._seq, data)
+        self._artnet.send_packet(self._trigger_view)
 
-        # Cancel any ongoing packet send task
+        # Cancel any ongoing packet send task. It must not resend the packet buffer, which now holds the new packet.
         current_task = asyncio.current_task()
         if self._current_task is not None and self._current_task != current_task:
             self._current_task.cancel()
 
         # Start a new packet send task
         self._current_task = asyncio.create_task(
-            self._send_packets(self._seq, data)
+            self._send_packets(self._seq)
         )
 
-    async def _send_packets(self, seq: int, data: bytes | bytearray) -> None:
-        for _ in range(3):
-            await asyncio.sleep(0.5)
-            self._artnet.send_trigger(key=76, subkey=seq, data=data)
+    async def _send_packets(self, seq: int) -> None:
+        link = self._link
+        if link is None:
+            for _ in range(3):
+                await asyncio.sleep(0.5)
+                self._artnet.send_packet(self._trigger_view)
+            return
+
+        # Retransmit with exponential backoff until acknowledged, as often as the link quality requires
+        retransmits = link.retransmits()
+        timeout_ms = _ACK_TIMEOUT_MS
+        for attempt in range(retransmits + 1):
+            await asyncio.sleep_ms(timeout_ms)
+            acknowledged = self._acked_seq == seq
+            link.record(acknowledged)
+            if acknowledged or attempt == retransmits:
+                return
+            link.retransmitted += 1
+            self._artnet.send_packet(self._trigger_view)
+            timeout_ms *= 2
+
+    def acknowledge(self, seq: int) -> None:
+        """Called by the node when the host acknowledged a trigger packet."""
+        self._acked_seq = seq
@@ -23,5 +23,5 @@ class SevenSegmentDisplay(Fixture):
 
     def parse_dmx_data(self, data: bytes) -> None:
         brightness: int = data[0]
-        self._display.text(data[1:].decode("ascii"))
+        self._display.text(bytes(data[1:]).decode("ascii"))
         self._display.brightness(brightness)
@@ -1,4 +1,4 @@
-from machine import Pin, SoftSPI, I2C
+from machine import Pin, SoftSPI, SPI, I2C
 from .sensor import Sensor
 from .fixture import Fixture
 from controlpanel.upy.artnet import ArtNet
@@ -7,24 +7,69 @@ from micropython import const
 
 
 _DEFAULT_POLLING_RATE_HZ = const(10.0)  # for PISO
-_DEFAULT_UPDATE_RATE_HZ = const(2.0)  # for SIPO
+_DEFAULT_UPDATE_RATE_HZ = const(0.0)  # for SIPO, which writes its outputs as soon as the DMX data arrives
+_DEFAULT_SNAPSHOT_INTERVAL_MS = const(1000)  # for PISO
+_SNAPSHOT = const(0)
+_CHANGES = const(1)
+
+
+try:
+    from controlpanel.upy.c_modules.shift_register_diff import diff_into
+except ImportError:
+    print("shift_register_diff.mpy is missing, shift registers are compared in Python")
+
+    def diff_into(out: memoryview, current: bytearray, previous: bytearray) -> int:
+        """Reference implementation of the native module, see shift_register_diff.c.
+        Writes a little-endian uint16 (bit index << 1 | new value) for every bit that differs between current and
+        previous into out, and returns how many, or -1 if they don't fit."""
+        if current == previous:
+            return 0  # the usual case, compared without looping in Python
+        capacity = len(out) // 2
+        count = 0
+        for i in range(len(current)):
+            changed = current[i] ^ previous[i]
+            bit = 0
+            while changed:
+                if changed & 1:
+                    if count == capacity:
+                        return -1
+                    entry = ((i * 8 + bit) << 1) | ((current[i] >> bit) & 1)
+                    out[2 * count] = entry & 0xFF
+                    out[2 * count + 1] = entry >> 8
+                    count += 1
+                changed >>= 1
+                bit += 1
+        return count
 
 
 class PisoShiftRegister(Sensor):
+    """Reports only the inputs that changed (_CHANGES followed by a uint16 per input, see diff_into).
+    A snapshot of all inputs (_SNAPSHOT followed by the raw bytes) is sent instead on the first read, if it is smaller
+    than the change list, and every snapshot_interval_ms as a heartbeat, so the host recovers from lost packets."""
+
     def __init__(self,
-                 _context: tuple[ArtNet, SoftSPI, I2C],
+                 _context: tuple[ArtNet, SoftSPI | SPI, I2C],
                  _name: str,
                  latch: int,
                  count: int = 1,
                  *,
                  polling_rate_hz: float = _DEFAULT_POLLING_RATE_HZ,
+                 snapshot_interval_ms: int = _DEFAULT_SNAPSHOT_INTERVAL_MS,
                  ) -> None:
         super().__init__(_context[0], _name, polling_rate_hz)
-        self._spi: SoftSPI = _context[1]
+        self._spi: SoftSPI | SPI = _context[1]
         self._latch_pin: Pin = Pin(latch, Pin.OUT)
         self._count = count
         self._buffers = [bytearray(self._count), bytearray(self._count)]  # Two alternating buffers
         self._active_index = 0
+        self._synced: bool = False  # whether the host has received a snapshot yet
+        self._configure_reporting(0, snapshot_interval_ms)
+
+        # The payload is assembled in the trigger packet, which is made large enough for a snapshot once
+        length = self._reserve_payload(1 + count)
+        self._payload: memoryview = memoryview(self._trigger_packet)[self._payload_offset:length]
+        # A change list is only sent if it is smaller than a snapshot
+        self._changes: memoryview = self._payload[1:1 + 2 * ((count - 1) // 2)]
 
     def _read_states(self):
         buf = self._buffers[self._active_index]
@@ -38,23 +83,33 @@ class PisoShiftRegister(Sensor):
         # Read new states into current buffer
         self._spi.readinto(buf, 0x42)
 
-        # Compare with previous
-        if buf != prev_buf:
-            self._send_trigger_packet(buf)
+        # Compare with previous, writing the changes straight into the trigger packet
+        changes = diff_into(self._changes, buf, prev_buf) if self._synced else -1
+        if changes > 0:
+            self._payload[0] = _CHANGES
+            self._report_due(True)
+            self._send_trigger(self._payload_offset + 1 + 2 * changes)
+        elif changes < 0 or self._report_due(False):
+            self._payload[0] = _SNAPSHOT
+            self._payload[1:] = buf
+            self._synced = True
+            self._report_due(True)
+            self._send_trigger(self._payload_offset + 1 + self._count)
 
         # Swap buffers (no copy, no new alloc)
         self._active_index = 1 - self._active_index
 
-
-
     async def update(self) -> None:
         self._read_states()
 
 
 class SipoShiftRegister(Fixture):
+    """Expects one bit per output, packed LSB first: output i is bit i % 8 of byte i // 8.
+    The bytes are shifted out in order, so the first byte ends up in the register at the far end of the chain."""
+
     def __init__(
             self,
-            _context: tuple[ArtNet, SoftSPI, I2C],
+            _context: tuple[ArtNet, SoftSPI | SPI, I2C],
             _name: str,
             latch: int,
             count: int = 1,
@@ -63,13 +118,20 @@ class SipoShiftRegister(Fixture):
             universe: int | None = None,
         ) -> None:
         super().__init__(_context[0], _name, update_rate_hz, universe=universe)
-        self._spi: SoftSPI = _context[1]
+        self._spi: SoftSPI | SPI = _context[1]
         self._latch_pin: Pin = Pin(latch, Pin.OUT)
-        self._number_of_bits = count * 8
+        self._count = count
+
+    def _write_states(self, data: memoryview) -> None:
+        self._latch_pin.off()
+        self._spi.write(data)
+        self._latch_pin.on()  # the outputs change on the rising edge
 
-    def _write_states(self, data: bytes) -> None:
-        raise NotImplementedError  # TODO: Restore functionality!
+    def parse_dmx_data(self, data: memoryview):
+        if len(data) < self._count:
+            print(f"Expected {self._count} bytes for '{self.name}', received {len(data)}")
+            return
+        self._write_states(data[:self._count])  # straight from the receive buffer, without copying
 
-    def parse_dmx_data(self, data: bytes):
-        assert len(data) == self._number_of_bits
-        self._write_states(data)
+    async def update(self) -> None:
+        pass
@@ -1,10 +1,11 @@
 from machine import Pin, SoftSPI, I2C
-import struct
 from controlpanel.upy.phys import Sensor
 from controlpanel.upy.artnet import ArtNet
 
 
 class WaterFlowSensor(Sensor):
+    irq_driven = True
+
     def __init__(
             self,
             _context: tuple[ArtNet, SoftSPI, I2C],
@@ -16,12 +17,17 @@ class WaterFlowSensor(Sensor):
         self._pin = Pin(pin, Pin.IN, Pin.PULL_UP)
         self._pin.irq(trigger=Pin.IRQ_RISING, handler=self.water_flow_irq_handler)  # correct edge?
         self._flow_counter: int = 0
+        self._flowing: bool = False  # cleared by the first update without new pulses
 
     def water_flow_irq_handler(self, pin: Pin):
         self._flow_counter += 1
+        if not self._flowing:
+            self._flowing = True
+            self._notify()  # report the start of a flow right away, the rest is summed up until the next update
 
     async def update(self) -> None:
         if not self._flow_counter:
+            self._flowing = False
             return
-        self._send_trigger_packet(struct.pack("<I", self._flow_counter))
+        self._pack_trigger_packet("<I", self._flow_counter)
         self._flow_counter = 0
@@ -0,0 +1,146 @@
+import asyncio
+import heapq
+import _thread
+from time import ticks_ms, ticks_diff
+from micropython import const
+from controlpanel.upy.phys import Fixture, Sensor
+
+
+_MAX_SLEEP_MS = const(1000)  # upper bound for a single sleep, so the scheduler never sleeps through a missed wakeup
+
+
+class DeviceStats:
+    __slots__ = ("runs", "overruns", "errors", "max_duration_ms")
+
+    def __init__(self) -> None:
+        self.runs: int = 0
+        self.overruns: int = 0  # deadlines that were skipped because the device was still due from an earlier one
+        self.errors: int = 0
+        self.max_duration_ms: int = 0
+
+
+class DeviceScheduler:
+    """Updates all devices of a node from a single task.
+    The next deadline of every device is kept in a min-heap, so the scheduler only wakes up when a device is due.
+    Deadlines are fixed-rate: they lie on a grid of update_rate_ms from the first update, no matter how long the
+    updates take. If a device falls behind, the missed deadlines are skipped and counted as overruns.
+    Interrupt-driven sensors (irq_driven) are not polled for their events, their interrupt handlers wake the scheduler
+    through a ThreadSafeFlag instead, which then updates them right away."""
+
+    def __init__(self, devices: dict[str, Sensor | Fixture]) -> None:
+        self._devices: dict[str, Sensor | Fixture] = devices
+        self.stats: dict[str, DeviceStats] = {name: DeviceStats() for name in devices}
+        self.running: bool = True
+        self._heap: list[list] = []  # [due, tie breaker, device name, generation]
+        self._generations: dict[str, int] = {name: 0 for name in devices}  # stale heap entries have an older one
+        self._tie_breaker: int = 0
+        # Monotonic time in ms since the scheduler was created, so deadlines can be compared across a ticks wraparound
+        self._clock: int = 0
+        self._last_ticks: int = ticks_ms()
+        self._reschedule = asyncio.Event()  # set when a deadline may have moved forward while run() sleeps
+
+        self._wake = asyncio.ThreadSafeFlag()
+        self._irq_devices: list[Sensor] = [
+            device for device in devices.values() if getattr(device, "irq_driven", False)
+        ]
+        for device in self._irq_devices:
+            device._wake = self._wake
+
+        # Rate changes arrive on the Art-Net thread and are applied on the event loop
+        self._rate_changes: dict[str, int] = {}
+        self._rate_lock = _thread.allocate_lock()
+
+        now = self._now()
+        for name, device in devices.items():
+            if device.update_rate_ms > 0:
+                self._push(name, now)
+
+    def _now(self) -> int:
+        ticks = ticks_ms()
+        self._clock += ticks_diff(ticks, self._last_ticks)
+        self._last_ticks = ticks
+        return self._clock
+
+    def _push(self, name: str, due: int) -> None:
+        self._tie_breaker += 1
+        heapq.heappush(self._heap, [due, self._tie_breaker, name, self._generations[name]])
+
+    def set_rate(self, name: str, rate_hz: float) -> bool:
+        """Change the update rate of a device, 0 stops updating it. Safe to call from any thread."""
+        if name not in self._devices:
+            return False
+        with self._rate_lock:
+            self._rate_changes[name] = int(1000 / rate_hz) if rate_hz > 0.0 else 0
+        self._wake.set()
+        return True
+
+    def _apply_rate_changes(self) -> None:
+        with self._rate_lock:
+            if not self._rate_changes:
+                return
+            changes, self._rate_changes = self._rate_changes, {}
+        now = self._now()
+        for name, update_rate_ms in changes.items():
+            self._devices[name].update_rate_ms = update_rate_ms
+            self._generations[name] += 1  # drop the pending deadline, the new rate starts right away
+            if update_rate_ms > 0:
+                self._push(name, now)
+        self._reschedule.set()
+
+    async def _update(self, name: str, device: Sensor | Fixture) -> None:
+        stats = self.stats[name]
+        start = ticks_ms()
+        try:
+            await device.update()
+        except Exception as e:
+            stats.errors += 1
+            print(f"Failed to update device '{name}': {e}")
+        stats.runs += 1
+        duration = ticks_diff(ticks_ms(), start)
+        if duration > stats.max_duration_ms:
+            stats.max_duration_ms = duration
+
+    async def _handle_wakeups(self) -> None:
+        while self.running:
+            await self._wake.wait()
+            self._apply_rate_changes()
+            for device in self._irq_devices:
+                if device._irq_pending:
+                    device._irq_pending = False
+                    await self._update(device.name, device)
+
+    async def run(self) -> None:
+        asyncio.create_task(self._handle_wakeups())
+        heap = self._heap
+        while self.running:
+            # Cleared before the next deadline is read, so a rate change after this point always ends the sleep
+            self._reschedule.clear()
+            delay = heap[0][0] - self._now() if heap else _MAX_SLEEP_MS
+            if delay > 0:
+                try:
+                    await asyncio.wait_for_ms(self._reschedule.wait(), min(delay, _MAX_SLEEP_MS))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due, _, name, generation = heapq.heappop(heap)
+            if generation != self._generations[name]:
+                continue
+            device = self._devices[name]
+            await self._update(name, device)
+
+            update_rate_ms = device.update_rate_ms
+            if update_rate_ms <= 0 or generation != self._generations[name]:
+                continue  # the rate was changed while updating and the device has been rescheduled already
+            due += update_rate_ms
+            now = self._now()
+            if due < now:
+                missed = (now - due) // update_rate_ms + 1
+                self.stats[name].overruns += missed
+                due += missed * update_rate_ms
+            self._push(name, due)
+
+    def print_stats(self) -> None:
+        for name, stats in self.stats.items():
+            print(f"{name}: {self._devices[name].update_rate_ms}ms | Runs: {stats.runs} | "
+                  f"Overruns: {stats.overruns} | Errors: {stats.errors} | Max: {stats.max_duration_ms}ms")
@@ -0,0 +1,87 @@
+"""Measures how long it takes to resolve an event to its subscribers.
+Compares the SubscriberIndex against the previous approach of probing every wildcard combination of the event.
+
+Usage: python -m dev_tools.benchmarks.dispatch [--subscribers 10000] [--events 100000]
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+from controlpanel.api.commons import Condition, Subscriber
+from controlpanel.api.subscriber_index import SubscriberIndex
+
+
+SOURCES = [f"Sensor{i}" for i in range(500)]
+ACTIONS = ["ButtonPressed", "ButtonReleased", "ButtonsChanged", "ValueRead"]
+
+
+def _callback(event) -> None:
+    pass
+
+
+def make_conditions(count: int, rng: random.Random) -> list[Condition]:
+    conditions: list[Condition] = []
+    for _ in range(count):
+        source = rng.choice(SOURCES) if rng.random() > 0.05 else None
+        action = rng.choice(ACTIONS) if rng.random() > 0.3 else None
+        value = rng.choice((True, False)) if rng.random() > 0.8 else None
+        conditions.append(Condition(source, action, value))
+    return conditions
+
+
+def make_events(count: int, rng: random.Random) -> list[tuple[str, str, bool]]:
+    return [(rng.choice(SOURCES), rng.choice(ACTIONS), rng.choice((True, False))) for _ in range(count)]
+
+
+def bench_probing(conditions: list[Condition], events: list[tuple[str, str, bool]]) -> float:
+    register: dict[Condition, list[Subscriber]] = defaultdict(list)
+    for condition in conditions:
+        register[condition].append(Subscriber(_callback, condition, False, False, True))
+    patterns = [
+        lambda s, a, v: (s, a, v),
+        lambda s, a, v: (s, a, None),
+        lambda s, a, v: (s, None, v),
+        lambda s, a, v: (s, None, None),
+        lambda s, a, v: (None, a, v),
+        lambda s, a, v: (None, a, None),
+        lambda s, a, v: (None, None, v),
+        lambda s, a, v: (None, None, None),
+    ]
+    start = time.perf_counter()
+    for source, action, value in events:
+        for pattern in patterns:
+            for _ in register.get(Condition(*pattern(source, action, value)), []):
+                pass
+    return time.perf_counter() - start
+
+
+def bench_index(conditions: list[Condition], events: list[tuple[str, str, bool]]) -> float:
+    index = SubscriberIndex()
+    for condition in conditions:
+        index.add(Subscriber(_callback, condition, False, False, True))
+    start = time.perf_counter()
+    for source, action, value in events:
+        for _ in index.resolve(source, action, value):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark event dispatch")
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    conditions = make_conditions(args.subscribers, rng)
+    events = make_events(args.events, rng)
+
+    print(f"Resolving {args.events} events against {args.subscribers} subscribers:")
+    for name, bench in (("probing", bench_probing), ("index", bench_index)):
+        elapsed = bench(conditions, events)
+        print(f"{name:<10}{1e6 * elapsed / args.events:8.2f} µs/event")
+
+
+if __name__ == "__main__":
+    main()
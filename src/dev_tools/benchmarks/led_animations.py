@@ -0,0 +1,134 @@
+"""Checks that the native animations in upy/c_modules/led_animations.c render exactly the same frames as the reference
+animations in shared/base/led_strip.py, and compares the time per frame.
+led_animations.c is compiled for the host, see native.py. The times are host times, the C ones include the ctypes call.
+
+Usage: python -m dev_tools.benchmarks.led_animations [--frames 300] [--cc cc]
+"""
+import argparse
+import ctypes
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Generator
+from controlpanel.shared.base.led_strip import BaseLEDStrip, animation_step, advance_position
+from . import native
+
+
+_FRAME_MASK = 0xFFFF  # as in upy/phys/led_strip.py
+
+LED_COUNTS = (1, 2, 7, 60, 241)
+SPEEDS = (0.0, 3.3, 40.0)
+UPDATE_RATE_MS = 33
+COLOR1 = (200, 10, 60)
+COLOR2 = (5, 180, 90)
+
+# Calls render() with the arguments LEDStrip passes on the node. Returns -1 if it raised, see last_error().
+_HARNESS = r"""
+#include "led_animations.c"
+
+int render_frame(int index, uint8_t *buf, size_t led_count, uint32_t frame, uint32_t position,
+                 uint8_t *colors, uint8_t *scratch) {
+    host_buffer_t buf_obj = {buf, 3 * led_count};
+    host_buffer_t colors_obj = {colors, 6};
+    host_buffer_t scratch_obj = {scratch, led_count};
+    mp_obj_t args[6] = {(mp_obj_t)(intptr_t)index, &buf_obj, (mp_obj_t)(uintptr_t)frame,
+                        (mp_obj_t)(uintptr_t)position, &colors_obj, &scratch_obj};
+    if (setjmp(host_raise)) {
+        return -1;
+    }
+    render(6, args);
+    return 0;
+}
+"""
+
+
+def build(compiler: str, directory: Path) -> ctypes.CDLL:
+    """Compiles led_animations.c for the host and loads it."""
+    library = native.build("led_animations", _HARNESS, compiler, directory)
+    library.render_frame.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint32, ctypes.c_uint32,
+                                     ctypes.c_void_p, ctypes.c_void_p]
+    library.render_frame.restype = ctypes.c_int
+    return library
+
+
+def native_animation(library: ctypes.CDLL,
+                     index: int,
+                     update_rate_ms: int,
+                     buf: bytearray,
+                     speed: float,
+                     color1: tuple[int, int, int],
+                     color2: tuple[int, int, int],
+                     ) -> Generator[None, None, None]:
+    """Host version of _native_animation in upy/phys/led_strip.py."""
+    step = animation_step(update_rate_ms, speed)
+    led_count = len(buf) // 3
+    colors = (ctypes.c_uint8 * 6)(*color1, *color2)
+    scratch = (ctypes.c_uint8 * max(1, led_count))()
+    buf_pointer = (ctypes.c_uint8 * len(buf)).from_buffer(buf) if buf else None
+    frame = 0
+    position = 0
+    while True:
+        if library.render_frame(index, buf_pointer, led_count, frame, position, colors, scratch) < 0:
+            raise ValueError(library.last_error().decode())
+        yield None
+        frame = (frame + 1) & _FRAME_MASK
+        position = advance_position(position, step, led_count)
+
+
+def first_mismatch(library: ctypes.CDLL, index: int, led_count: int, speed: float, frames: int) -> str | None:
+    """Renders frames with both implementations and describes the first differing pixel, if any."""
+    reference_buf = bytearray(3 * led_count)
+    native_buf = bytearray(3 * led_count)
+    reference = BaseLEDStrip.ANIMATIONS[index](UPDATE_RATE_MS, reference_buf, speed, COLOR1, COLOR2)
+    native = native_animation(library, index, UPDATE_RATE_MS, native_buf, speed, COLOR1, COLOR2)
+    for frame in range(frames):
+        next(reference)
+        next(native)
+        if reference_buf != native_buf:
+            pixel = next(i for i in range(led_count) if reference_buf[3 * i:3 * i + 3] != native_buf[3 * i:3 * i + 3])
+            return (f"{led_count} LEDs at {speed} LEDs/s, frame {frame}, LED {pixel}: "
+                    f"Python {tuple(reference_buf[3 * pixel:3 * pixel + 3])}, "
+                    f"C {tuple(native_buf[3 * pixel:3 * pixel + 3])}")
+    return None
+
+
+def time_per_frame(animation: Generator[None, None, None], frames: int) -> float:
+    """Returns the time in µs per frame."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        next(animation)
+    return 1e6 * (time.perf_counter() - start) / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the native LED animations against the Python reference")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--cc", default="cc", help="C compiler for the host")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        library = build(args.cc, Path(directory))
+
+        mismatches = 0
+        print(f"{'Animation':<14}{'Result':<10}{'Python µs/frame':>17}{'C µs/frame':>12}")
+        for index, animation in enumerate(BaseLEDStrip.ANIMATIONS):
+            problems = [problem for led_count in LED_COUNTS for speed in SPEEDS
+                        if (problem := first_mismatch(library, index, led_count, speed, args.frames)) is not None]
+            mismatches += len(problems)
+
+            buf = bytearray(3 * 60)
+            reference_time = time_per_frame(animation(UPDATE_RATE_MS, buf, SPEEDS[1], COLOR1, COLOR2), args.frames)
+            native = native_animation(library, index, UPDATE_RATE_MS, buf, SPEEDS[1], COLOR1, COLOR2)
+            native_time = time_per_frame(native, args.frames)
+            result = "matches" if not problems else f"{len(problems)} differ"
+            print(f"{animation.__name__:<14}{result:<10}{reference_time:>17.2f}{native_time:>12.2f}")
+            for problem in problems:
+                print(f"    {problem}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compiles the native modules in upy/c_modules for the host, so they can be checked against their Python versions.
+The modules are built against a minimal stand-in for MicroPython's py/dynruntime.h, so neither a MicroPython checkout
+nor the ESP32 toolchain is needed.
+"""
+import ctypes
+import subprocess
+from pathlib import Path
+
+
+C_MODULES = Path(__file__).parents[2] / "controlpanel" / "upy" / "c_modules"
+
+# Just enough of py/dynruntime.h for the modules. Integers are passed as the object pointer itself and buffers as a
+# pointer to a host_buffer_t. A raised ValueError jumps back to the harness, which must setjmp(host_raise) first.
+_DYNRUNTIME_STUB = r"""
+#include <setjmp.h>
+#include <stddef.h>
+#include <stdint.h>
+
+typedef void *mp_obj_t;
+typedef intptr_t mp_int_t;
+typedef struct { void *buf; size_t len; } mp_buffer_info_t;
+typedef struct { int unused; } mp_obj_fun_bc_t;
+typedef struct { void *buf; size_t len; } host_buffer_t;
+
+#define MP_BUFFER_READ 1
+#define MP_BUFFER_WRITE 2
+#define MP_ERROR_TEXT(text) text
+#define mp_const_none NULL
+#define MP_OBJ_FROM_PTR(ptr) ((mp_obj_t)(ptr))
+#define MP_OBJ_NEW_SMALL_INT(value) ((mp_obj_t)(intptr_t)(value))
+#define MP_DEFINE_CONST_FUN_OBJ_3(name, fun) int name
+#define MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(name, n_args_min, n_args_max, fun) int name
+#define MP_DYNRUNTIME_INIT_ENTRY
+#define MP_DYNRUNTIME_INIT_EXIT return mp_const_none;
+#define mp_store_global(qstr, obj) (void)(obj)
+
+static jmp_buf host_raise;
+static const char *host_error = "";
+
+static void mp_raise_ValueError(const char *message) {
+    host_error = message;
+    longjmp(host_raise, 1);
+}
+
+static void mp_get_buffer_raise(mp_obj_t obj, mp_buffer_info_t *info, int flags) {
+    host_buffer_t *buffer = obj;
+    info->buf = buffer->buf;
+    info->len = buffer->len;
+    (void)flags;
+}
+
+static mp_int_t mp_obj_get_int(mp_obj_t obj) {
+    return (mp_int_t)obj;
+}
+
+const char *last_error(void) {
+    return host_error;
+}
+"""
+
+
+def build(module: str, harness: str, compiler: str, directory: Path) -> ctypes.CDLL:
+    """Compiles harness, which includes "<module>.c", into a shared library in directory and loads it.
+    The library exports last_error() for the message of the last raised ValueError."""
+    (directory / "py").mkdir(exist_ok=True)
+    (directory / "py" / "dynruntime.h").write_text(_DYNRUNTIME_STUB)
+    harness_path = directory / f"{module}_harness.c"
+    harness_path.write_text(harness)
+    library_path = directory / f"{module}.so"
+    subprocess.run([compiler, "-O2", "-shared", "-fPIC", "-I", str(directory), "-I", str(C_MODULES),
+                    "-o", str(library_path), str(harness_path)], check=True)
+    library = ctypes.CDLL(str(library_path))
+    library.last_error.restype = ctypes.c_char_p
+    return library
@@ -0,0 +1,90 @@
+"""Measures allocations and time per received Art-Net packet on the node.
+Compares the eager parse_* functions, which decode every field into a dict, against the lazily decoded packet views,
+which are reused for every packet and only decode the fields the node actually reads.
+Op codes without a view in ARTNET_PACKET_VIEWS are only measured as dicts, as that is how ArtNet handles them.
+
+Usage: python -m dev_tools.benchmarks.packet_parsing [--packets 10000]
+"""
+import argparse
+import importlib.util
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+# The upy artnet package imports MicroPython-only modules, so load the helper module on its own
+_HELPER_PATH = Path(__file__).parents[2] / "controlpanel" / "upy" / "artnet" / "helper.py"
+_spec = importlib.util.spec_from_file_location("upy_artnet_helper", _HELPER_PATH)
+helper = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(helper)
+
+
+# name, op code, packet, the fields the node reads from it
+PACKETS: list[tuple[str, Any, bytes, tuple[str, ...]]] = [
+    ("ArtPoll", helper.OpCode.ArtPoll, helper.pack_poll(), ()),
+    ("ArtPollReply", helper.OpCode.ArtPollReply,
+     helper.pack_poll_reply("10.0.0.2", 6454, "node", "A node", "#0001 [0000] OK", "02:00:00:00:00:01"),
+     ("ShortName", "Mac")),
+    ("ArtCommand", helper.OpCode.ArtCommand, helper.pack_command(b"ACK 5000 17"), ("Command",)),
+    ("ArtSync", helper.OpCode.ArtSync, helper.pack_sync(), ()),
+    ("ArtTrigger", helper.OpCode.ArtTrigger, helper.pack_trigger(76, 1, bytearray(b"button\x00\x01")),
+     ("Key", "SubKey", "Data")),
+]
+
+
+def bench(decode: Callable[[memoryview, int], Any], fields: tuple[str, ...], packet: bytes, count: int) -> float:
+    """Returns the time in µs per packet."""
+    buffer = bytearray(1024)
+    buffer[:len(packet)] = packet
+    view = memoryview(buffer)
+    size = len(packet)
+    start = time.perf_counter()
+    for _ in range(count):
+        reply = decode(view, size)
+        for field in fields:
+            reply.get(field)
+    return 1e6 * (time.perf_counter() - start) / count
+
+
+def measure_allocations(decode: Callable[[memoryview, int], Any], fields: tuple[str, ...], packet: bytes) -> int:
+    """Returns the peak number of bytes allocated while handling a single packet."""
+    buffer = bytearray(1024)
+    buffer[:len(packet)] = packet
+    view = memoryview(buffer)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    reply = decode(view, len(packet))
+    values = [reply.get(field) for field in fields]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del values
+    return peak - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Art-Net packet parsing")
+    parser.add_argument("--packets", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'Packet':<14}{'Decoder':<8}{'Bytes/packet':>14}{'µs/packet':>12}")
+    for name, op_code, packet, fields in PACKETS:
+        parse = helper.ARTNET_REPLY_PARSER[op_code]
+        view = helper.ARTNET_PACKET_VIEWS[op_code]() if op_code in helper.ARTNET_PACKET_VIEWS else None
+
+        def eager(buffer: memoryview, size: int) -> Any:
+            return parse(bytes(buffer[:size]))  # what ArtNet._dispatch does for op codes without a view
+
+        def lazy(buffer: memoryview, size: int) -> Any:
+            view.bind(buffer, size)
+            return view
+
+        decoders = (("dict", eager), ("view", lazy)) if view is not None else (("dict", eager),)
+        for decoder, decode in decoders:
+            allocated = measure_allocations(decode, fields, packet)
+            elapsed = bench(decode, fields, packet, args.packets)
+            print(f"{name:<14}{decoder:<8}{allocated:>14}{elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
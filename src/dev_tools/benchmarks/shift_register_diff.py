@@ -0,0 +1,120 @@
+"""Checks that diff_into of upy/c_modules/shift_register_diff.c writes exactly the same change list as the Python
+fallback in upy/phys/shift_registers.py, for random register states and change list sizes.
+shift_register_diff.c is compiled for the host, see native.py.
+
+Usage: python -m dev_tools.benchmarks.shift_register_diff [--cases 2000] [--cc cc]
+"""
+import argparse
+import ast
+import ctypes
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+from . import native
+
+
+_SHIFT_REGISTERS_PATH = Path(__file__).parents[2] / "controlpanel" / "upy" / "phys" / "shift_registers.py"
+
+# Calls diff_into() like PisoShiftRegister does on the node. Returns -2 if it raised, see last_error().
+_HARNESS = r"""
+#include "shift_register_diff.c"
+
+int diff(uint8_t *out, size_t out_len, uint8_t *current, size_t current_len, uint8_t *previous, size_t previous_len) {
+    host_buffer_t out_obj = {out, out_len};
+    host_buffer_t current_obj = {current, current_len};
+    host_buffer_t previous_obj = {previous, previous_len};
+    if (setjmp(host_raise)) {
+        return -2;
+    }
+    return (int)(intptr_t)diff_into(&out_obj, &current_obj, &previous_obj);
+}
+"""
+
+DiffInto = Callable[[bytearray, bytearray, bytearray], int]
+
+
+def load_fallback() -> DiffInto:
+    """The Python diff_into of shift_registers.py. The module itself needs machine, so only the function is loaded."""
+    tree = ast.parse(_SHIFT_REGISTERS_PATH.read_text())
+    for node in tree.body:
+        if not isinstance(node, ast.Try):
+            continue
+        for handler in node.handlers:
+            for statement in handler.body:
+                if isinstance(statement, ast.FunctionDef) and statement.name == "diff_into":
+                    namespace: dict = {}
+                    exec(compile(ast.Module([statement], []), str(_SHIFT_REGISTERS_PATH), "exec"), namespace)
+                    return namespace["diff_into"]
+    raise LookupError(f"No fallback diff_into in {_SHIFT_REGISTERS_PATH}")
+
+
+def _pointer(buffer: bytearray) -> int | None:
+    return ctypes.addressof((ctypes.c_uint8 * len(buffer)).from_buffer(buffer)) if buffer else None
+
+
+def build(compiler: str, directory: Path) -> DiffInto:
+    """Compiles shift_register_diff.c for the host and returns its diff_into."""
+    library = native.build("shift_register_diff", _HARNESS, compiler, directory)
+    library.diff.argtypes = [ctypes.c_void_p, ctypes.c_size_t] * 3
+    library.diff.restype = ctypes.c_int
+
+    def diff_into(out: bytearray, current: bytearray, previous: bytearray) -> int:
+        result = library.diff(_pointer(out), len(out), _pointer(current), len(current),
+                              _pointer(previous), len(previous))
+        if result == -2:
+            raise ValueError(library.last_error().decode())
+        return result
+
+    return diff_into
+
+
+def random_case(rng: random.Random) -> tuple[int, bytearray, bytearray]:
+    """Returns the capacity of the change list and two register states, with between none and all bits changed."""
+    count = rng.randint(1, 16)
+    previous = bytearray(rng.getrandbits(8) for _ in range(count))
+    current = bytearray(previous)
+    for _ in range(rng.choice((0, 1, 2, 5, 8 * count))):
+        bit = rng.randrange(8 * count)
+        current[bit >> 3] ^= 1 << (bit & 7)
+    # PisoShiftRegister makes room for (count - 1) // 2 changes, the larger ones check the overflow handling as well
+    capacity = rng.choice(((count - 1) // 2, 8 * count))
+    return capacity, current, previous
+
+
+def run(diff_into: DiffInto, capacity: int, current: bytearray, previous: bytearray) -> tuple[int, bytes]:
+    out = bytearray(2 * capacity)
+    count = diff_into(out, current, previous)
+    return count, bytes(out[:2 * max(0, count)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the native shift register diff against the Python fallback")
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--cc", default="cc", help="C compiler for the host")
+    args = parser.parse_args()
+
+    fallback = load_fallback()
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        native_diff = build(args.cc, Path(directory))
+
+        mismatches = 0
+        for _ in range(args.cases):
+            capacity, current, previous = random_case(rng)
+            expected = run(fallback, capacity, current, previous)
+            actual = run(native_diff, capacity, current, previous)
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"    {current.hex()} vs {previous.hex()}, room for {capacity}: "
+                          f"Python {expected}, C {actual}")
+        print(f"{args.cases - mismatches} of {args.cases} cases match")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -129,6 +129,8 @@ def generate_overloads(devices: Dict[str, Dict[str, str]]) -> str:
         lines.append(f"    value: {value_type_str} | None = None,")
         lines.append("    fire_once: bool = False,")
         lines.append("    allow_parallelism: bool = False,")
+        lines.append("    coalesce: bool = False,")
+        lines.append("    inline: bool = False,")
         lines.append(
             f") -> Callable[[Callable[[Event[{base_value_type}]], None]], Callable[[Event[{base_value_type}]], None]]: ...")
         lines.append("")
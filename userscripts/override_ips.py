@@ -13,8 +13,9 @@ ip_mapping: dict[str, str] = {
     "chronometer": "151.219.201.103", #'0C:B8:15:75:A4:98'
 }
 
-for node in api.services.event_manager._nodes:
+nodes = api.services.event_manager._nodes
+for node in nodes:
     for name, ip in ip_mapping.items():
         if node.name == name:
-            node.ip = ip
+            nodes.set_ip(node, ip)
     api.services.artnet.send_poll(ip_override=node.ip)